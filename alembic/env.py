@@ -16,8 +16,11 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+from app.config import settings
 from app.database.database import Base
-from app.models.tasks import Task, TaskAssignee
+from app.models.changes import ChangeLogState, TaskChange
+from app.models.stats import TaskStat
+from app.models.tasks import Task, TaskAssignee, TaskClosure, TaskStatusRollup
 from app.models.users import User
 
 # add your model's MetaData object here
@@ -26,6 +29,18 @@ from app.models.users import User
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+config.set_main_option("sqlalchemy.url", settings.database_url)
+
+# Таблицы, создаваемые миграциями вручную (FTS5 и её теневые таблицы),
+# не описаны в моделях и не должны попадать в autogenerate
+UNMANAGED_TABLE_PREFIXES = ("tasks_fts", "users_fts")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLE_PREFIXES)
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -51,6 +66,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -58,7 +74,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,34 @@
+"""Task listing indexes
+
+Revision ID: 35fd34b642f4
+Revises: b795513715e8
+Create Date: 2026-10-18 13:00:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '35fd34b642f4'
+down_revision: Union[str, None] = 'b795513715e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_parent_id_id', 'tasks', ['parent_id', 'id'], unique=False)
+    op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], unique=False)
+    op.create_index('ix_tasks_author_id_id', 'tasks', ['author_id', 'id'], unique=False)
+    op.create_index('ix_tasks_end_date_id', 'tasks', ['end_date', 'id'], unique=False)
+    op.create_index('ix_task_assignees_task_id_user_id', 'task_assignees', ['task_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_assignees_task_id_user_id', table_name='task_assignees')
+    op.drop_index('ix_tasks_end_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_author_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_parent_id_id', table_name='tasks')
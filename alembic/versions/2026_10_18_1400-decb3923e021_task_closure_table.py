@@ -0,0 +1,49 @@
+"""Task closure table
+
+Revision ID: decb3923e021
+Revises: 35fd34b642f4
+Create Date: 2026-10-18 14:00:41.902117
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'decb3923e021'
+down_revision: Union[str, None] = '35fd34b642f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['descendant_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_task_closure_descendant_id_depth', 'task_closure', ['descendant_id', 'depth'], unique=False)
+    op.execute(
+        """
+        WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM tasks
+            UNION ALL
+            SELECT closure.ancestor_id, tasks.id, closure.depth + 1
+            FROM closure JOIN tasks ON tasks.parent_id = closure.descendant_id
+        )
+        INSERT INTO task_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM closure
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_closure_descendant_id_depth', table_name='task_closure')
+    op.drop_table('task_closure')
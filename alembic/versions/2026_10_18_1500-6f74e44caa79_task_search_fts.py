@@ -0,0 +1,66 @@
+"""Task full-text search
+
+Revision ID: 6f74e44caa79
+Revises: decb3923e021
+Create Date: 2026-10-18 15:00:12.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6f74e44caa79'
+down_revision: Union[str, None] = 'decb3923e021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            title, description,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """
+    )
+    # Совпадение в заголовке весит больше, чем в описании
+    op.execute("INSERT INTO tasks_fts(tasks_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_fts(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+        """
+    )
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_fts_au")
+    op.execute("DROP TRIGGER tasks_fts_ad")
+    op.execute("DROP TRIGGER tasks_fts_ai")
+    op.execute("DROP TABLE tasks_fts")
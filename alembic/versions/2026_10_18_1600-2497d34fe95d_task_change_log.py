@@ -0,0 +1,74 @@
+"""Task change log
+
+Revision ID: 2497d34fe95d
+Revises: 6f74e44caa79
+Create Date: 2026-10-18 16:00:35.598347
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2497d34fe95d'
+down_revision: Union[str, None] = '6f74e44caa79'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Одна строка журнала на задачу: REPLACE удаляет прежнюю строку задачи
+# и вставляет новую со следующим seq
+LOG_TASK = "INSERT OR REPLACE INTO task_changes (task_id, deleted) VALUES ({}, {});"
+# Изменения назначений удаляемой задачи не должны затирать её надгробие
+LOG_ASSIGNEE = (
+    "INSERT OR REPLACE INTO task_changes (task_id, deleted) "
+    "SELECT {0}, 0 WHERE EXISTS (SELECT 1 FROM tasks WHERE id = {0});"
+)
+TRIGGERS = {
+    "task_changes_tasks_ai": ("AFTER INSERT ON tasks", LOG_TASK.format("new.id", 0)),
+    "task_changes_tasks_au": ("AFTER UPDATE ON tasks", LOG_TASK.format("new.id", 0)),
+    "task_changes_tasks_ad": ("AFTER DELETE ON tasks", LOG_TASK.format("old.id", 1)),
+    "task_changes_assignees_ai": (
+        "AFTER INSERT ON task_assignees",
+        LOG_ASSIGNEE.format("new.task_id"),
+    ),
+    "task_changes_assignees_au": (
+        "AFTER UPDATE ON task_assignees",
+        LOG_ASSIGNEE.format("new.task_id"),
+    ),
+    "task_changes_assignees_ad": (
+        "AFTER DELETE ON task_assignees",
+        LOG_ASSIGNEE.format("old.task_id"),
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('change_log_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('horizon_seq', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('task_changes',
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), server_default=sa.text('0'), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sa.UniqueConstraint('task_id'),
+    sqlite_autoincrement=True
+    )
+    op.execute("INSERT INTO change_log_state (id, horizon_seq) VALUES (1, 0)")
+    op.execute("INSERT INTO task_changes (task_id) SELECT id FROM tasks ORDER BY id")
+    for name, (event, statement) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {event} BEGIN {statement} END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name}")
+    op.drop_table('task_changes')
+    op.drop_table('change_log_state')
@@ -0,0 +1,106 @@
+"""Task stats summary
+
+Revision ID: af6f9f08d205
+Revises: 2497d34fe95d
+Create Date: 2026-10-18 17:00:52.104371
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'af6f9f08d205'
+down_revision: Union[str, None] = '2497d34fe95d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN = "{0}.status != 'completed' AND {0}.end_date IS NOT NULL"
+
+
+def bump(dimension: str, key: str, delta: int, condition: str = "1") -> str:
+    return (
+        "INSERT INTO task_stats (dimension, key, count) "
+        f"SELECT '{dimension}', {key}, {delta} WHERE {condition} "
+        "ON CONFLICT (dimension, key) DO UPDATE SET count = count + excluded.count;"
+    )
+
+
+def task_counters(row: str, delta: int) -> str:
+    return " ".join(
+        [
+            bump("total", "''", delta),
+            bump("status", f"{row}.status", delta),
+            bump("author", f"{row}.author_id", delta),
+            bump("open_due_day", f"date({row}.end_date)", delta, OPEN.format(row)),
+        ]
+    )
+
+
+TRIGGERS = {
+    "task_stats_tasks_ai": ("AFTER INSERT ON tasks", task_counters("new", 1)),
+    "task_stats_tasks_ad": ("AFTER DELETE ON tasks", task_counters("old", -1)),
+    "task_stats_tasks_au": (
+        "AFTER UPDATE OF status, author_id, end_date ON tasks",
+        " ".join(
+            [
+                bump("status", "old.status", -1, "old.status IS NOT new.status"),
+                bump("status", "new.status", 1, "old.status IS NOT new.status"),
+                bump("author", "old.author_id", -1, "old.author_id != new.author_id"),
+                bump("author", "new.author_id", 1, "old.author_id != new.author_id"),
+                bump("open_due_day", "date(old.end_date)", -1, OPEN.format("old")),
+                bump("open_due_day", "date(new.end_date)", 1, OPEN.format("new")),
+            ]
+        ),
+    ),
+    "task_stats_assignees_ai": (
+        "AFTER INSERT ON task_assignees",
+        bump("assignee", "new.user_id", 1),
+    ),
+    "task_stats_assignees_ad": (
+        "AFTER DELETE ON task_assignees",
+        bump("assignee", "old.user_id", -1),
+    ),
+    "task_stats_assignees_au": (
+        "AFTER UPDATE OF user_id ON task_assignees",
+        bump("assignee", "old.user_id", -1) + " " + bump("assignee", "new.user_id", 1),
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_stats',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'key'),
+    sqlite_with_rowid=False
+    )
+    op.execute(
+        """
+        INSERT INTO task_stats (dimension, key, count)
+        SELECT 'total', '', count(*) FROM tasks
+        UNION ALL
+        SELECT 'status', status, count(*) FROM tasks GROUP BY status
+        UNION ALL
+        SELECT 'author', author_id, count(*) FROM tasks GROUP BY author_id
+        UNION ALL
+        SELECT 'assignee', user_id, count(*) FROM task_assignees GROUP BY user_id
+        UNION ALL
+        SELECT 'open_due_day', date(end_date), count(*) FROM tasks
+        WHERE status != 'completed' AND end_date IS NOT NULL
+        GROUP BY date(end_date)
+        """
+    )
+    for name, (event, statements) in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {event} BEGIN {statements} END")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER {name}")
+    op.drop_table('task_stats')
@@ -0,0 +1,64 @@
+"""Task subtree rollups
+
+Revision ID: 20c8852db080
+Revises: af6f9f08d205
+Create Date: 2026-10-18 18:00:41.528314
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '20c8852db080'
+down_revision: Union[str, None] = 'af6f9f08d205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_status_rollups',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'status'),
+    sqlite_with_rowid=False
+    )
+    op.add_column('tasks', sa.Column('descendant_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('tasks', sa.Column('earliest_open_end_date', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.execute(
+        """
+        INSERT INTO task_status_rollups (task_id, status, count)
+        SELECT task_closure.ancestor_id, tasks.status, count(*)
+        FROM task_closure JOIN tasks ON tasks.id = task_closure.descendant_id
+        WHERE task_closure.depth > 0
+        GROUP BY task_closure.ancestor_id, tasks.status
+        """
+    )
+    op.execute(
+        """
+        UPDATE tasks
+        SET descendant_count = rollup.descendants,
+            earliest_open_end_date = rollup.earliest
+        FROM (
+            SELECT task_closure.ancestor_id,
+                   count(*) AS descendants,
+                   min(CASE WHEN tasks.status != 'completed' THEN tasks.end_date END) AS earliest
+            FROM task_closure JOIN tasks ON tasks.id = task_closure.descendant_id
+            WHERE task_closure.depth > 0
+            GROUP BY task_closure.ancestor_id
+        ) AS rollup
+        WHERE tasks.id = rollup.ancestor_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'earliest_open_end_date')
+    op.drop_column('tasks', 'descendant_count')
+    op.drop_table('task_status_rollups')
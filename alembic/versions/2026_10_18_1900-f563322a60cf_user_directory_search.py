@@ -0,0 +1,67 @@
+"""User directory prefix search
+
+Revision ID: f563322a60cf
+Revises: 20c8852db080
+Create Date: 2026-10-18 19:00:41.263118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f563322a60cf'
+down_revision: Union[str, None] = '20c8852db080'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # unicode61 приводит к нижнему регистру и кириллицу (lower() в SQLite - только ASCII),
+    # индексы префиксов 1-3 символов ускоряют первые нажатия в поле подсказок
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE users_fts USING fts5(
+            name, surname, email,
+            content='users', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_ai AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts(rowid, name, surname, email)
+            VALUES (new.id, new.name, new.surname, new.email);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_ad AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, name, surname, email)
+            VALUES ('delete', old.id, old.name, old.surname, old.email);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_fts_au AFTER UPDATE OF name, surname, email ON users BEGIN
+            INSERT INTO users_fts(users_fts, rowid, name, surname, email)
+            VALUES ('delete', old.id, old.name, old.surname, old.email);
+            INSERT INTO users_fts(rowid, name, surname, email)
+            VALUES (new.id, new.name, new.surname, new.email);
+        END
+        """
+    )
+    op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER users_fts_au")
+    op.execute("DROP TRIGGER users_fts_ad")
+    op.execute("DROP TRIGGER users_fts_ai")
+    op.execute("DROP TABLE users_fts")
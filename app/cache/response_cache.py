@@ -0,0 +1,177 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+RESPONSE_CACHE_SIZE = 256
+VERSION_SLOTS = 4096
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Сериализованный ответ в кэше.
+
+    Attributes:
+        body (bytes): Тело ответа в JSON
+        headers (dict[str, str]): Дополнительные заголовки ответа
+        etag (str): Сильный ETag тела ответа
+        tags (tuple[str, ...]): Теги данных, от которых зависит ответ
+        versions (tuple[int, ...]): Версии тегов на момент чтения данных
+    """
+
+    body: bytes
+    headers: dict[str, str]
+    etag: str
+    tags: tuple[str, ...]
+    versions: tuple[int, ...]
+
+
+class ResponseCache:
+    """LRU-кэш сериализованных ответов с инвалидацией по версиям тегов.
+
+    Каждая запись помечена тегами ("tasks", "task:<id>", "users"). Запись
+    действительна, пока версии её тегов совпадают с текущими. Версии
+    хранятся в фиксированном массиве слотов, поэтому память не растёт
+    с числом задач, а коллизия лишь изредка сбрасывает лишнюю запись.
+
+    Снимок версий берётся до чтения из БД: если запись изменилась между
+    чтением и сохранением в кэш, сохранённая запись сразу будет устаревшей.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._versions = [0] * VERSION_SLOTS
+
+    def _slot(self, tag: str) -> int:
+        return hash(tag) % VERSION_SLOTS
+
+    def snapshot(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        """Получить текущие версии тегов."""
+        return tuple(self._versions[self._slot(tag)] for tag in tags)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Получить действительную запись и отметить её как недавно использованную."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.snapshot(entry.tags) != entry.versions:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        headers: dict[str, str],
+        tags: tuple[str, ...],
+        versions: tuple[int, ...],
+    ) -> CacheEntry:
+        """Сохранить ответ, вытеснив самую давнюю запись при переполнении."""
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+        entry = CacheEntry(
+            body=body, headers=headers, etag=etag, tags=tags, versions=versions
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        """Увеличить версии тегов, сделав зависящие от них записи устаревшими."""
+        for tag in tags:
+            self._versions[self._slot(tag)] += 1
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def task_tag(task_id: int) -> str:
+    """Тег данных отдельной задачи."""
+    return f"task:{task_id}"
+
+
+def render_json(adapter: TypeAdapter[Any], data: Any) -> bytes:
+    """Сериализовать данные через схему ответа так же, как это делает FastAPI
+
+    Args:
+        adapter (TypeAdapter): Адаптер схемы ответа
+        data (Any): ORM-объекты или словари
+
+    Returns:
+        bytes: JSON-представление ответа
+    """
+    return adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+
+
+def render_rows(data: Any) -> bytes:
+    """Сериализовать готовые словари ответа без валидации схемой
+
+    Используется для данных, уже собранных в форме схемы ответа
+    (см. load_task_rows): порядок ключей и форматирование значений
+    должны совпадать со схемой, тогда JSON совпадает с render_json.
+
+    Args:
+        data (Any): Словари и списки с JSON-совместимыми значениями
+
+    Returns:
+        bytes: JSON-представление ответа
+    """
+    return to_json(data)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(
+        value.removeprefix("W/") == etag for value in candidates
+    )
+
+
+async def cached_json_response(
+    request: Request,
+    tags: tuple[str, ...],
+    render: Callable[[], Awaitable[tuple[bytes, dict[str, str]]]],
+) -> Response:
+    """Отдать JSON-ответ из кэша или сформировать и закэшировать его
+
+    Ключ кэша - путь и отсортированные параметры запроса. Ответ содержит
+    сильный ETag; при совпадении с If-None-Match возвращается 304 без тела.
+
+    Args:
+        request (Request): Входящий запрос
+        tags (tuple[str, ...]): Теги данных, от которых зависит ответ
+        render (Callable): Корутина, загружающая данные и возвращающая тело
+            ответа и дополнительные заголовки
+
+    Returns:
+        Response: Ответ 200 с телом или 304 Not Modified
+    """
+    key = request.url.path
+    if request.query_params:
+        key += "?" + "&".join(
+            f"{name}={value}"
+            for name, value in sorted(request.query_params.multi_items())
+        )
+
+    entry = response_cache.get(key)
+    if entry is None:
+        versions = response_cache.snapshot(tags)
+        body, headers = await render()
+        entry = response_cache.put(key, body, headers, tags, versions)
+
+    headers = {**entry.headers, "ETag": entry.etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.response_cache import response_cache
+from app.config import settings
+from app.database.database import AsyncReadSessionLocal, after_commit
+from app.models.users import User
+
+UserRow = dict[str, Any]
+
+USER_COLUMNS = (User.id, User.name, User.surname, User.email)
+
+
+def user_row(row: Row[Any]) -> UserRow:
+    """Собрать данные пользователя в форме UserResponse."""
+    return {"name": row.name, "surname": row.surname, "email": row.email}
+
+
+class UserCache:
+    """LRU-кэш пользователей процесса по ID.
+
+    Хранит пользователей в форме UserResponse (имя, фамилия, email):
+    авторы и исполнители задач подставляются из кэша, а из БД одним
+    IN-запросом загружаются только отсутствующие в нём. Кэш прогревается
+    при старте приложения; если в него поместились все пользователи,
+    он же отдаёт полный список для GET /api/users.
+
+    Кэш локален для процесса, поэтому записи пользователей должны
+    вызывать invalidate_users (после фиксации транзакции).
+    """
+
+    def __init__(self, max_entries: int = settings.user_cache_size) -> None:
+        self.max_entries = max_entries
+        self._users: OrderedDict[int, UserRow] = OrderedDict()
+        self._complete = False
+
+    def _put(self, user_id: int, user: UserRow) -> None:
+        self._users[user_id] = user
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_entries:
+            self._users.popitem(last=False)
+            self._complete = False
+
+    def _fill(self, rows: list[Row[Any]]) -> None:
+        """Заменить содержимое кэша пользователями из БД по возрастанию ID."""
+        self._users.clear()
+        for row in rows[: self.max_entries]:
+            self._users[row.id] = user_row(row)
+        self._complete = len(rows) <= self.max_entries
+
+    async def warm(self) -> None:
+        """Загрузить пользователей в кэш при старте приложения."""
+        async with AsyncReadSessionLocal() as session:
+            rows = await session.execute(
+                select(*USER_COLUMNS).order_by(User.id).limit(self.max_entries + 1)
+            )
+            self._fill(list(rows))
+
+    async def get_many(
+        self, session: AsyncSession, user_ids: Iterable[int]
+    ) -> dict[int, UserRow]:
+        """Получить пользователей по ID, догрузив отсутствующих в кэше
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy
+            user_ids (Iterable[int]): ID нужных пользователей
+
+        Returns:
+            dict[int, UserRow]: Индекс id -> пользователь в форме UserResponse
+        """
+        users = {}
+        missing = []
+        for user_id in set(user_ids):
+            user = self._users.get(user_id)
+            if user is None:
+                missing.append(user_id)
+            else:
+                self._users.move_to_end(user_id)
+                users[user_id] = user
+        if missing:
+            rows = await session.execute(
+                select(*USER_COLUMNS).where(User.id.in_(missing))
+            )
+            for row in rows:
+                user = user_row(row)
+                self._put(row.id, user)
+                users[row.id] = user
+        return users
+
+    async def list_all(self, session: AsyncSession) -> list[UserRow]:
+        """Получить всех пользователей в форме AllUserResponse по возрастанию ID
+
+        Если кэш содержит всех пользователей, БД не читается; иначе список
+        загружается из БД и, если помещается, заменяет содержимое кэша.
+
+        Args:
+            session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+        Returns:
+            list[UserRow]: Пользователи с полями id, name, surname, email
+        """
+        if self._complete:
+            return [
+                {"id": user_id, **user} for user_id, user in sorted(self._users.items())
+            ]
+        rows = list(await session.execute(select(*USER_COLUMNS).order_by(User.id)))
+        if len(rows) <= self.max_entries:
+            self._fill(rows)
+        return [row._asdict() for row in rows]
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Удалить пользователей из кэша (без ID - очистить кэш целиком)."""
+        if user_ids:
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+        else:
+            self._users.clear()
+        self._complete = False
+
+
+user_cache = UserCache()
+
+
+def invalidate_users(session: AsyncSession, *user_ids: int) -> None:
+    """Сбросить кэш пользователей и зависящие от них ответы после коммита
+
+    Args:
+        session (AsyncSession): Сессия, в которой изменяются пользователи
+        *user_ids (int): ID изменённых пользователей (без ID - все)
+    """
+    after_commit(session, lambda: user_cache.invalidate(*user_ids))
+    after_commit(session, lambda: response_cache.invalidate("users"))
@@ -0,0 +1,137 @@
+import os
+from dataclasses import dataclass
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None or value == "" else int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value is None or value == "" else float(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Настройки приложения, читаемые из переменных окружения.
+
+    Attributes:
+        database_url (str): URL базы данных (DATABASE_URL)
+        db_profile (str): Профиль движка: "default" или "production" (DB_PROFILE)
+        db_read_pool_size (int): Число соединений для чтения в production
+            (DB_READ_POOL_SIZE)
+        sqlite_journal_mode (str): PRAGMA journal_mode (SQLITE_JOURNAL_MODE)
+        sqlite_synchronous (str): PRAGMA synchronous (SQLITE_SYNCHRONOUS)
+        sqlite_busy_timeout_ms (int): PRAGMA busy_timeout в мс
+            (SQLITE_BUSY_TIMEOUT_MS)
+        sqlite_cache_size (int): PRAGMA cache_size, отрицательное - в КиБ
+            (SQLITE_CACHE_SIZE)
+        sqlite_mmap_size (int): PRAGMA mmap_size в байтах (SQLITE_MMAP_SIZE)
+        sqlite_temp_store (str): PRAGMA temp_store (SQLITE_TEMP_STORE)
+        write_batching (bool): Включить групповую фиксацию записей (WRITE_BATCHING)
+        write_batch_window_ms (float): Окно сбора пачки записей в мс
+            (WRITE_BATCH_WINDOW_MS)
+        write_batch_max_size (int): Максимум операций в пачке (WRITE_BATCH_MAX_SIZE)
+        strict_loading (bool): Падать на незапланированной lazy-загрузке связей
+            вместо молчаливого noload (DB_STRICT_LOADING)
+        seed_users (int): Число пользователей для генератора при первом запуске
+            (SEED_USERS)
+        seed_tasks (int): Число задач для генератора при первом запуске;
+            0 - фиксированный набор populate_database (SEED_TASKS)
+        seed_random (int): Зерно генератора данных (SEED_RANDOM)
+        events_queue_size (int): Размер очереди событий одного подписчика потока
+            изменений; переполнивший её клиент отключается (EVENTS_QUEUE_SIZE)
+        change_log_retention_hours (float): Срок хранения записей журнала изменений;
+            более старые курсоры дельта-синхронизации получают 410
+            (CHANGE_LOG_RETENTION_HOURS)
+        user_cache_size (int): Максимум пользователей в кэше процесса, из которого
+            берутся авторы и исполнители задач (USER_CACHE_SIZE)
+    """
+
+    database_url: str = "sqlite+aiosqlite:///./app.db"
+    db_profile: str = "default"
+    db_read_pool_size: int = 8
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -65536
+    sqlite_mmap_size: int = 268435456
+    sqlite_temp_store: str = "MEMORY"
+    write_batching: bool = False
+    write_batch_window_ms: float = 2.0
+    write_batch_max_size: int = 64
+    strict_loading: bool = False
+    seed_users: int = 100
+    seed_tasks: int = 0
+    seed_random: int = 42
+    events_queue_size: int = 256
+    change_log_retention_hours: float = 24.0
+    user_cache_size: int = 50000
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Собрать настройки из переменных окружения со значениями по умолчанию."""
+        defaults = cls()
+        return cls(
+            database_url=os.getenv("DATABASE_URL", defaults.database_url),
+            db_profile=os.getenv("DB_PROFILE", defaults.db_profile),
+            db_read_pool_size=_env_int("DB_READ_POOL_SIZE", defaults.db_read_pool_size),
+            sqlite_journal_mode=os.getenv(
+                "SQLITE_JOURNAL_MODE", defaults.sqlite_journal_mode
+            ),
+            sqlite_synchronous=os.getenv(
+                "SQLITE_SYNCHRONOUS", defaults.sqlite_synchronous
+            ),
+            sqlite_busy_timeout_ms=_env_int(
+                "SQLITE_BUSY_TIMEOUT_MS", defaults.sqlite_busy_timeout_ms
+            ),
+            sqlite_cache_size=_env_int("SQLITE_CACHE_SIZE", defaults.sqlite_cache_size),
+            sqlite_mmap_size=_env_int("SQLITE_MMAP_SIZE", defaults.sqlite_mmap_size),
+            sqlite_temp_store=os.getenv(
+                "SQLITE_TEMP_STORE", defaults.sqlite_temp_store
+            ),
+            write_batching=_env_bool("WRITE_BATCHING", defaults.write_batching),
+            write_batch_window_ms=_env_float(
+                "WRITE_BATCH_WINDOW_MS", defaults.write_batch_window_ms
+            ),
+            write_batch_max_size=_env_int(
+                "WRITE_BATCH_MAX_SIZE", defaults.write_batch_max_size
+            ),
+            strict_loading=_env_bool("DB_STRICT_LOADING", defaults.strict_loading),
+            seed_users=_env_int("SEED_USERS", defaults.seed_users),
+            seed_tasks=_env_int("SEED_TASKS", defaults.seed_tasks),
+            seed_random=_env_int("SEED_RANDOM", defaults.seed_random),
+            events_queue_size=_env_int("EVENTS_QUEUE_SIZE", defaults.events_queue_size),
+            change_log_retention_hours=_env_float(
+                "CHANGE_LOG_RETENTION_HOURS", defaults.change_log_retention_hours
+            ),
+            user_cache_size=_env_int("USER_CACHE_SIZE", defaults.user_cache_size),
+        )
+
+    @property
+    def is_production(self) -> bool:
+        """Включён ли production-профиль движка."""
+        return self.db_profile == "production"
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        """PRAGMA, применяемые к каждому новому соединению SQLite в production."""
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "busy_timeout": self.sqlite_busy_timeout_ms,
+            "cache_size": self.sqlite_cache_size,
+            "mmap_size": self.sqlite_mmap_size,
+            "temp_store": self.sqlite_temp_store,
+        }
+
+
+settings = Settings.from_env()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.response_cache import response_cache
+from app.config import settings
+from app.database.database import AsyncSessionLocal
+from app.models.changes import ChangeLogState, TaskChange
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_INTERVAL_SECONDS = 3600.0
+
+
+async def change_log_horizon(session: AsyncSession) -> int:
+    """Получить горизонт журнала: курсоры меньше него устарели
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        int: Наибольший seq, удалённый при уплотнении
+    """
+    horizon = await session.scalar(
+        select(ChangeLogState.horizon_seq).where(ChangeLogState.id == 1)
+    )
+    return horizon or 0
+
+
+async def change_log_cursor(session: AsyncSession) -> int:
+    """Получить курсор, соответствующий текущему состоянию данных
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        int: Последний seq журнала (не меньше горизонта)
+    """
+    last_seq = await session.scalar(select(func.max(TaskChange.seq)))
+    return max(last_seq or 0, await change_log_horizon(session))
+
+
+async def compact_change_log(session: AsyncSession, retention_hours: float) -> int:
+    """Удалить из журнала записи старше срока хранения и сдвинуть горизонт
+
+    Клиенту с курсором не меньше горизонта удалённые записи не нужны:
+    их изменения уже учтены его курсором. Клиент с более старым курсором
+    получает 410 и загружает дерево заново.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        retention_hours (float): Срок хранения записей в часах
+
+    Returns:
+        int: Число удалённых записей
+    """
+    cutoff = func.datetime("now", f"{-int(retention_hours * 3600)} seconds")
+    horizon = await session.scalar(
+        select(func.max(TaskChange.seq)).where(TaskChange.changed_at < cutoff)
+    )
+    if horizon is None:
+        return 0
+
+    result = await session.execute(delete(TaskChange).where(TaskChange.seq <= horizon))
+    await session.execute(
+        update(ChangeLogState)
+        .where(ChangeLogState.id == 1)
+        .values(horizon_seq=func.max(ChangeLogState.horizon_seq, horizon))
+    )
+    return result.rowcount
+
+
+class ChangeLogCompactor:
+    """Периодическое уплотнение журнала изменений в фоне.
+
+    Уплотнение выполняется при запуске и затем раз в interval секунд
+    в отдельной транзакции.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        retention_hours: float = settings.change_log_retention_hours,
+        interval: float = COMPACTION_INTERVAL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.retention_hours = retention_hours
+        self.interval = interval
+        self._worker: asyncio.Task[None] | None = None
+
+    async def compact(self) -> int:
+        """Уплотнить журнал и зафиксировать изменения."""
+        async with self.session_factory() as session:
+            removed = await compact_change_log(session, self.retention_hours)
+            await session.commit()
+        if removed:
+            # Закэшированные ответы /api/tasks/changes не знают о новом горизонте
+            response_cache.invalidate("tasks")
+        return removed
+
+    async def start(self) -> None:
+        """Уплотнить журнал и запустить периодическое уплотнение."""
+        await self.compact()
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить периодическое уплотнение."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                removed = await self.compact()
+            except SQLAlchemyError:
+                logger.exception("Change log compaction failed")
+            else:
+                logger.info("Change log compaction removed %d entries", removed)
+
+
+change_log_compactor = ChangeLogCompactor()
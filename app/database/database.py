@@ -1,8 +1,27 @@
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Callable, Literal
 
-from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncAttrs,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction
+
+from app.config import settings
+from app.metrics.sql import instrument_engine
+
+UNPLANNED_LAZY: Literal["raise", "noload"] = (
+    "raise" if settings.strict_loading else "noload"
+)
+"""Стратегия загрузки связей моделей по умолчанию.
+
+Связи не загружаются неявно: каждый обработчик явно выбирает профиль
+загрузки из app.models.loaders. В режиме DB_STRICT_LOADING обращение
+к незагруженной связи приводит к ошибке запроса.
+"""
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -16,16 +35,153 @@ class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
-engine = create_async_engine("sqlite+aiosqlite:///./app.db")
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in settings.sqlite_pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _begin_explicitly(engine: AsyncEngine, begin_statement: str) -> None:
+    """Передать управление транзакциями SQLite из драйвера в SQLAlchemy.
+
+    Драйвер sqlite3 сам решает, когда выполнять BEGIN: перед SELECT он
+    транзакцию не открывает, а SAVEPOINT с ним работают некорректно.
+    Групповой фиксации записей SAVEPOINT нужны, чтобы ошибка одной операции
+    не откатывала остальные операции пачки, а чтению - одна транзакция
+    на все запросы обработчика, чтобы они видели один снимок данных.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection: Any, record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(connection: Any) -> None:
+        connection.exec_driver_sql(begin_statement)
+
+
+def _make_sqlite_read_only(engine: AsyncEngine) -> None:
+    """Настроить движок SQLite только для чтения.
+
+    Каждое соединение получает PRAGMA query_only, поэтому случайная запись
+    через сессию чтения завершается ошибкой, а транзакция открывается
+    BEGIN DEFERRED: в WAL она не берёт блокировок записи и завершается
+    ROLLBACK при возврате соединения в пул, без COMMIT.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_query_only(dbapi_connection: Any, record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    _begin_explicitly(engine, "BEGIN DEFERRED")
+
+
+def create_engines() -> tuple[AsyncEngine, AsyncEngine]:
+    """Создать движки для записи и чтения согласно профилю настроек.
+
+    При включённой групповой фиксации (WRITE_BATCHING) движок записи SQLite
+    дополнительно настраивается на явные BEGIN для поддержки SAVEPOINT.
+
+    В профиле "default" используется один движок с настройками по умолчанию.
+    В профиле "production" создаются пул соединений для чтения и отдельный
+    движок с единственным соединением для записи, а для SQLite на каждом
+    соединении включаются WAL и настроенные PRAGMA, соединения чтения
+    работают в режиме query_only. Запись через одно соединение исключает
+    ошибки "database is locked" между писателями, а WAL позволяет
+    читателям не ждать писателя.
+
+    Returns:
+        tuple[AsyncEngine, AsyncEngine]: Движок для записи и движок для чтения
+    """
+    if not settings.is_production:
+        engine = create_async_engine(settings.database_url)
+        if settings.write_batching and engine.dialect.name == "sqlite":
+            _begin_explicitly(engine, "BEGIN")
+        return engine, engine
+
+    write_engine = create_async_engine(
+        settings.database_url, pool_size=1, max_overflow=0
+    )
+    read_engine = create_async_engine(
+        settings.database_url, pool_size=settings.db_read_pool_size, max_overflow=0
+    )
+    if write_engine.dialect.name == "sqlite":
+        for sqlite_engine in (write_engine, read_engine):
+            event.listen(sqlite_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        _make_sqlite_read_only(read_engine)
+        if settings.write_batching:
+            _begin_explicitly(write_engine, "BEGIN IMMEDIATE")
+    return write_engine, read_engine
+
+
+engine, read_engine = create_engines()
+for instrumented_engine in {engine, read_engine}:
+    instrument_engine(instrumented_engine)
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine, expire_on_commit=False, autoflush=False
+)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Зарегистрировать действие, выполняемое после успешного коммита сессии.
+
+    Используется для побочных эффектов записи (инвалидация кэшей и т.п.),
+    которые не должны срабатывать, если транзакция откатилась.
+
+    Args:
+        session (AsyncSession): Сессия, в которой выполняется запись
+        callback (Callable[[], None]): Действие без аргументов
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def lock_for_write(session: AsyncSession) -> None:
+    """Взять блокировку записи SQLite до проверок, от которых зависит запись.
+
+    Драйвер sqlite3 открывает транзакцию только перед первым изменением,
+    поэтому SELECT-проверки (например, на цикл при переносе поддерева)
+    выполняются без блокировки и могут устареть к моменту записи
+    параллельного запроса. Если транзакция ещё не начата, выполняется
+    BEGIN IMMEDIATE: проверки и запись идут под одной блокировкой.
+    Начатая транзакция (явные BEGIN при групповой фиксации) не меняется.
+
+    Args:
+        session (AsyncSession): Сессия, в которой выполняется запись
+    """
+    connection = await session.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    driver_connection = (await connection.get_raw_connection()).driver_connection
+    if driver_connection is not None and not driver_connection.in_transaction:
+        await connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_commit(session: Session, transaction: SessionTransaction) -> None:
+    # Откат SAVEPOINT не отменяет действия внешней транзакции
+    if transaction.parent is None:
+        session.info.pop("after_commit", None)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Зависимость для инъекции асинхронной сессии БД.
 
     Создает новую сессию для каждого запроса и автоматически:
-        - Фиксирует изменения при успешном выполнении
+        - Фиксирует изменения одним commit() при успешном выполнении
+          (функции записи в task_management сами commit() не вызывают);
+          сессия без начатой транзакции, например при групповой фиксации,
+          не фиксируется
         - Откатывает при возникновении ошибок
         - Закрывает соединение
 
@@ -38,9 +194,27 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction():
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Зависимость для инъекции сессии БД в обработчики чтения.
+
+    Сессия открывается на пуле соединений для чтения, без autoflush
+    и без commit(): при закрытии транзакция откатывается, а загруженные
+    объекты отсоединяются без expire. В production-профиле SQLite все
+    запросы обработчика выполняются в одной транзакции BEGIN DEFERRED
+    на соединении с query_only (см. _make_sqlite_read_only).
+
+    Returns:
+        AsyncSession: Асинхронная сессия SQLAlchemy
+
+    Использование:
+        db = Depends(get_read_db) в GET-обработчиках FastAPI
+    """
+    async with AsyncReadSessionLocal() as session:
+        yield session
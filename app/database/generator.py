@@ -0,0 +1,309 @@
+"""Генератор синтетических данных для нагрузочных проверок.
+
+Пример запуска (таблицы должны быть созданы через alembic upgrade head):
+
+    python -m app.database.generator --users 1000 --tasks 1000000 --seed 7
+"""
+
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import cast
+
+from sqlalchemy import TableClause, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.cache.user_cache import invalidate_users
+from app.database.database import AsyncSessionLocal
+from app.models.tasks import Task, TaskAssignee
+from app.models.users import User
+from app.routers.task_tree import rebuild_task_closure, rebuild_task_rollups
+
+INSERT_CHUNK_SIZE = 20000
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """Параметры генерации данных.
+
+    Attributes:
+        users (int): Число пользователей
+        tasks (int): Число задач
+        seed (int): Зерно генератора случайных чисел
+        root_fraction (float): Доля корневых задач (минимум одна)
+        fan_out (int): Максимальное число подзадач у задачи
+        max_depth (int): Максимальная глубина вложенности (0 - только корни)
+        assignee_density (float): Среднее число исполнителей на задачу
+        status_mix (dict[str, float]): Веса статусов задач
+        completed_assignee_fraction (float): Доля назначений в статусе completed
+        end_date_from (datetime): Начало интервала сроков выполнения
+        end_date_days (int): Длина интервала сроков в днях
+    """
+
+    users: int = 100
+    tasks: int = 10000
+    seed: int = 42
+    root_fraction: float = 0.1
+    fan_out: int = 5
+    max_depth: int = 5
+    assignee_density: float = 1.0
+    status_mix: dict[str, float] = field(
+        default_factory=lambda: {"pending": 0.6, "in_progress": 0.25, "completed": 0.15}
+    )
+    completed_assignee_fraction: float = 0.2
+    end_date_from: datetime = datetime(2025, 1, 1)
+    end_date_days: int = 365
+
+
+MINUTES_PER_DAY = 24 * 60
+GENERATOR_CACHE_SIZE = -262144
+
+
+async def _bulk_insert(
+    connection: AsyncConnection,
+    table: TableClause,
+    columns: list[str],
+    rows: list[tuple],
+) -> None:
+    # executemany драйвера без обработки параметров SQLAlchemy построчно:
+    # значения уже приведены к формату хранения SQLite
+    statement = "INSERT INTO {} ({}) VALUES ({})".format(
+        table.name, ", ".join(columns), ", ".join("?" * len(columns))
+    )
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        end = start + INSERT_CHUNK_SIZE
+        await connection.exec_driver_sql(statement, rows[start:end])
+
+
+def build_parents(
+    config: GeneratorConfig, rng: random.Random, first_id: int
+) -> list[int | None]:
+    """Построить форму дерева: родителя для каждой задачи по порядку ID
+
+    Первые задачи становятся корнями, каждая следующая подвешивается
+    к случайной уже созданной задаче, у которой ещё есть место
+    по fan_out и max_depth. Родитель всегда имеет меньший ID.
+
+    Args:
+        config (GeneratorConfig): Параметры генерации
+        rng (random.Random): Генератор случайных чисел
+        first_id (int): ID первой создаваемой задачи
+
+    Returns:
+        list[int | None]: ID родителя для каждой задачи (None - корень)
+
+    Raises:
+        ValueError: Если задачи не помещаются в дерево с заданными ограничениями
+    """
+    roots = min(config.tasks, max(1, round(config.tasks * config.root_fraction)))
+    parents: list[int | None] = [None] * roots
+    if config.max_depth == 0 or config.fan_out == 0:
+        open_slots: list[tuple[int, int]] = []
+    else:
+        open_slots = [(first_id + offset, 0) for offset in range(roots)]
+    children_count: dict[int, int] = {}
+
+    for offset in range(roots, config.tasks):
+        if not open_slots:
+            raise ValueError(
+                "Tasks do not fit into the tree: increase root_fraction, "
+                "fan_out or max_depth"
+            )
+        position = rng.randrange(len(open_slots))
+        parent_id, depth = open_slots[position]
+        parents.append(parent_id)
+
+        children_count[parent_id] = children_count.get(parent_id, 0) + 1
+        if children_count[parent_id] >= config.fan_out:
+            open_slots[position] = open_slots[-1]
+            open_slots.pop()
+        if depth + 1 < config.max_depth:
+            open_slots.append((first_id + offset, depth + 1))
+
+    return parents
+
+
+def build_end_dates(
+    config: GeneratorConfig, rng: random.Random, count: int
+) -> list[str]:
+    """Сгенерировать сроки выполнения в формате хранения SQLite
+
+    Сроки равномерно распределены с точностью до минуты по end_date_days
+    дням, начиная с даты end_date_from. Строки дней и минут суток
+    форматируются один раз, а не strftime для каждой задачи.
+
+    Args:
+        config (GeneratorConfig): Параметры генерации
+        rng (random.Random): Генератор случайных чисел
+        count (int): Число сроков
+
+    Returns:
+        list[str]: Сроки вида "YYYY-MM-DD HH:MM:00.000000"
+    """
+    days = [
+        (config.end_date_from + timedelta(days=day)).strftime("%Y-%m-%d ")
+        for day in range(config.end_date_days)
+    ]
+    times = [
+        f"{minute // 60:02d}:{minute % 60:02d}:00.000000"
+        for minute in range(MINUTES_PER_DAY)
+    ]
+    span = config.end_date_days * MINUTES_PER_DAY
+    end_dates = []
+    for _ in range(count):
+        offset = int(rng.random() * span)
+        end_dates.append(
+            days[offset // MINUTES_PER_DAY] + times[offset % MINUTES_PER_DAY]
+        )
+    return end_dates
+
+
+async def generate_data(session: AsyncSession, config: GeneratorConfig) -> None:
+    """Сгенерировать пользователей, задачи и назначения bulk-вставками
+
+    Данные детерминированы зерном config.seed. Строки вставляются через
+    executemany драйвера пачками по INSERT_CHUNK_SIZE в одной транзакции,
+    таблица замыкания и сводки поддеревьев перестраиваются в конце. Новые
+    строки добавляются после уже существующих. Даты пишутся в формате
+    хранения SQLite, поэтому генератор рассчитан на SQLite.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        config (GeneratorConfig): Параметры генерации
+
+    Raises:
+        ValueError: Если задачи генерируются без пользователей-авторов
+    """
+    if config.tasks and not config.users:
+        raise ValueError("Tasks need at least one generated user as author")
+    rng = random.Random(config.seed)
+    connection = await session.connection()
+    first_user_id = (await session.scalar(select(func.max(User.id))) or 0) + 1
+    first_task_id = (await session.scalar(select(func.max(Task.id))) or 0) + 1
+    user_ids = range(first_user_id, first_user_id + config.users)
+
+    await _bulk_insert(
+        connection,
+        cast(TableClause, User.__table__),
+        ["id", "name", "surname", "email"],
+        [
+            (
+                user_id,
+                f"User{user_id}",
+                f"Generated{user_id}",
+                f"user{user_id}@example.com",
+            )
+            for user_id in user_ids
+        ],
+    )
+
+    parents = build_parents(config, rng, first_task_id)
+    task_ids = range(first_task_id, first_task_id + len(parents))
+    statuses = rng.choices(
+        list(config.status_mix),
+        weights=list(config.status_mix.values()),
+        k=len(parents),
+    )
+    end_dates = build_end_dates(config, rng, len(parents))
+    await _bulk_insert(
+        connection,
+        cast(TableClause, Task.__table__),
+        ["id", "title", "description", "end_date", "status", "parent_id", "author_id"],
+        [
+            (
+                task_id,
+                f"Task {task_id}",
+                f"Generated task {task_id}",
+                end_date,
+                status,
+                parent_id,
+                user_ids[int(rng.random() * config.users)],
+            )
+            for task_id, parent_id, status, end_date in zip(
+                task_ids, parents, statuses, end_dates
+            )
+        ],
+    )
+
+    whole, fraction = divmod(config.assignee_density, 1)
+    assignees = []
+    for task_id in task_ids:
+        count = min(config.users, int(whole) + (rng.random() < fraction))
+        for user_id in rng.sample(user_ids, count):
+            completed = rng.random() < config.completed_assignee_fraction
+            assignees.append(
+                (task_id, user_id, "completed" if completed else "pending")
+            )
+    await _bulk_insert(
+        connection,
+        cast(TableClause, TaskAssignee.__table__),
+        ["task_id", "user_id", "assignee_status"],
+        assignees,
+    )
+
+    await rebuild_task_closure(session)
+    await rebuild_task_rollups(session)
+    invalidate_users(session)
+    await session.commit()
+
+
+def _parse_status_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        status, _, weight = item.partition("=")
+        mix[status.strip()] = float(weight or 1)
+    return mix
+
+
+def parse_args(argv: list[str] | None = None) -> GeneratorConfig:
+    """Разобрать аргументы командной строки в параметры генерации."""
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Generate synthetic tasks and users")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--root-fraction", type=float, default=defaults.root_fraction)
+    parser.add_argument("--fan-out", type=int, default=defaults.fan_out)
+    parser.add_argument("--max-depth", type=int, default=defaults.max_depth)
+    parser.add_argument(
+        "--assignee-density", type=float, default=defaults.assignee_density
+    )
+    parser.add_argument(
+        "--status-mix",
+        type=_parse_status_mix,
+        default=defaults.status_mix,
+        help="e.g. pending=0.6,in_progress=0.25,completed=0.15",
+    )
+    parser.add_argument(
+        "--completed-assignee-fraction",
+        type=float,
+        default=defaults.completed_assignee_fraction,
+    )
+    parser.add_argument(
+        "--end-date-from",
+        type=datetime.fromisoformat,
+        default=defaults.end_date_from,
+    )
+    parser.add_argument("--end-date-days", type=int, default=defaults.end_date_days)
+    args = parser.parse_args(argv)
+    return GeneratorConfig(**vars(args))
+
+
+async def main(config: GeneratorConfig) -> None:
+    """Сгенерировать данные в базе из настроек приложения."""
+    started_at = perf_counter()
+    async with AsyncSessionLocal() as session:
+        connection = await session.connection()
+        await connection.exec_driver_sql(f"PRAGMA cache_size={GENERATOR_CACHE_SIZE}")
+        await generate_data(session, config)
+    print(
+        f"Generated {config.users} users and {config.tasks} tasks "
+        f"in {perf_counter() - started_at:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,126 @@
+"""Сводные счётчики задач для дашбордов.
+
+Счётчики ведутся триггерами в таблице task_stats (см. app.models.stats).
+Пересборка после ручных правок базы или для проверки расхождений:
+
+    python -m app.database.stats
+"""
+
+import asyncio
+from datetime import datetime, time
+from typing import Any
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import AsyncSessionLocal
+from app.models.stats import (
+    CLOSED_STATUS,
+    STAT_ASSIGNEE,
+    STAT_AUTHOR,
+    STAT_OPEN_DUE_DAY,
+    STAT_STATUS,
+    STAT_TOTAL,
+    TaskStat,
+)
+from app.models.tasks import Task, TaskAssignee
+from app.models.users import User  # noqa: F401 - связи Task ссылаются на User
+
+STAT_RESPONSE_FIELDS = {
+    STAT_STATUS: "by_status",
+    STAT_AUTHOR: "by_author",
+    STAT_ASSIGNEE: "by_assignee",
+}
+
+
+async def rebuild_task_stats(session: AsyncSession) -> None:
+    """Полностью пересобрать счётчики по таблицам задач и назначений
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+    """
+    open_task = (Task.status != CLOSED_STATUS) & Task.end_date.is_not(None)
+    due_day = func.date(Task.end_date)
+    counters = union_all(
+        select(literal(STAT_TOTAL), literal(""), func.count()).select_from(Task),
+        select(literal(STAT_STATUS), Task.status, func.count()).group_by(Task.status),
+        select(literal(STAT_AUTHOR), Task.author_id, func.count()).group_by(
+            Task.author_id
+        ),
+        select(literal(STAT_ASSIGNEE), TaskAssignee.user_id, func.count()).group_by(
+            TaskAssignee.user_id
+        ),
+        select(literal(STAT_OPEN_DUE_DAY), due_day, func.count())
+        .where(open_task)
+        .group_by(due_day),
+    )
+    await session.execute(delete(TaskStat))
+    await session.execute(
+        insert(TaskStat).from_select(["dimension", "key", "count"], counters)
+    )
+
+
+async def load_task_stats(session: AsyncSession, now: datetime) -> dict[str, Any]:
+    """Прочитать сводные счётчики задач
+
+    Стоимость не зависит от числа задач: читаются строки счётчиков
+    (по одной на статус, автора и исполнителя), просроченные задачи
+    считаются суммой счётчиков по дням сроков до сегодняшнего дня
+    и выборкой по индексу сроков только за сегодня.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        now (datetime): Момент, относительно которого считается просрочка
+
+    Returns:
+        dict[str, Any]: Данные в форме TaskStatsResponse
+    """
+    stats: dict[str, Any] = {
+        "total": 0,
+        "by_status": {},
+        "by_author": {},
+        "by_assignee": {},
+        "overdue": 0,
+    }
+    rows = await session.execute(
+        select(TaskStat.dimension, TaskStat.key, TaskStat.count).where(
+            TaskStat.dimension.in_([STAT_TOTAL, *STAT_RESPONSE_FIELDS]),
+            TaskStat.count != 0,
+        )
+    )
+    for row in rows:
+        if row.dimension == STAT_TOTAL:
+            stats["total"] = row.count
+        else:
+            stats[STAT_RESPONSE_FIELDS[row.dimension]][row.key] = row.count
+
+    day_start = datetime.combine(now.date(), time())
+    overdue_before_today = await session.scalar(
+        select(func.coalesce(func.sum(TaskStat.count), 0)).where(
+            TaskStat.dimension == STAT_OPEN_DUE_DAY,
+            TaskStat.key < now.date().isoformat(),
+        )
+    )
+    overdue_today = await session.scalar(
+        select(func.count())
+        .select_from(Task)
+        .where(
+            Task.end_date >= day_start,
+            Task.end_date < now,
+            Task.status != CLOSED_STATUS,
+        )
+    )
+    stats["overdue"] = (overdue_before_today or 0) + (overdue_today or 0)
+    return stats
+
+
+async def main() -> None:
+    """Пересобрать счётчики в базе из настроек приложения."""
+    async with AsyncSessionLocal() as session:
+        await rebuild_task_stats(session)
+        await session.commit()
+    print("Task stats rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
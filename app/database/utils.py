@@ -3,9 +3,13 @@ from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.user_cache import invalidate_users
+from app.config import settings
 from app.database.database import AsyncSessionLocal
+from app.database.generator import GeneratorConfig, generate_data
 from app.models.tasks import Task, TaskAssignee
 from app.models.users import User
+from app.routers.task_tree import rebuild_task_closure, rebuild_task_rollups
 
 
 async def populate_database(session: AsyncSession) -> None:
@@ -17,6 +21,7 @@ async def populate_database(session: AsyncSession) -> None:
     - 3 подзадачи
     - 1 вложенную подзадачу
     - Назначения исполнителей
+    - Таблицу замыкания иерархии
 
     Args:
         session (AsyncSession): Асинхронная сессия SQLAlchemy
@@ -93,6 +98,10 @@ async def populate_database(session: AsyncSession) -> None:
         TaskAssignee(user=users[0], task=subtasks[1]),
     ]
     session.add_all(assignees)
+    await session.flush()
+    await rebuild_task_closure(session)
+    await rebuild_task_rollups(session)
+    invalidate_users(session)
 
     await session.commit()
 
@@ -102,10 +111,19 @@ async def init_data() -> None:
 
     Проверяет наличие пользователей в БД:
     - Если пользователи существуют - пропускает заполнение
-    - Если БД пуста - вызывает populate_database()
+    - Если БД пуста и задан SEED_TASKS - вызывает generate_data()
+    - Иначе вызывает populate_database()
     """
     async with AsyncSessionLocal() as session:
-        result = await session.execute(select(User).limit(1))
+        result = await session.execute(select(User.id).limit(1))
         if result.scalars().first():
             return
+        if settings.seed_tasks > 0:
+            config = GeneratorConfig(
+                users=settings.seed_users,
+                tasks=settings.seed_tasks,
+                seed=settings.seed_random,
+            )
+            await generate_data(session, config)
+            return
         await populate_database(session)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.database import AsyncSessionLocal
+from app.metrics.sql import SqlStats, current_sql_stats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+@dataclass
+class WriteBatchMetrics:
+    """Метрики групповой фиксации записей.
+
+    Attributes:
+        batches (int): Число зафиксированных пачек
+        operations (int): Число обработанных операций
+        failed_operations (int): Число операций, завершившихся ошибкой
+        batch_size_buckets (dict[int, int]): Накопительная гистограмма размеров
+            пачек (граница -> число пачек размером не больше границы)
+        queue_wait_seconds (float): Суммарное время ожидания операций в очереди
+        max_queue_wait_seconds (float): Максимальное время ожидания в очереди
+    """
+
+    batches: int = 0
+    operations: int = 0
+    failed_operations: int = 0
+    batch_size_buckets: dict[int, int] = field(
+        default_factory=lambda: dict.fromkeys(BATCH_SIZE_BUCKETS, 0)
+    )
+    queue_wait_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+
+    def observe_batch(self, size: int, waits: list[float]) -> None:
+        """Учесть пачку из size операций и время ожидания каждой из них."""
+        self.batches += 1
+        self.operations += size
+        for bound in BATCH_SIZE_BUCKETS:
+            if size <= bound:
+                self.batch_size_buckets[bound] += 1
+        self.queue_wait_seconds += sum(waits)
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, *waits)
+
+
+@dataclass
+class _PendingWrite:
+    operation: WriteOperation[Any]
+    future: asyncio.Future[Any]
+    enqueued_at: float
+    sql_stats: SqlStats | None
+
+
+class WriteCoordinator:
+    """Координатор групповой фиксации операций записи.
+
+    Операции, пришедшие в течение окна window_ms (или пока не наберётся
+    max_batch_size), выполняются в одной транзакции: каждая - в своём
+    SAVEPOINT, затем следует один COMMIT. Ошибка операции откатывает только
+    её SAVEPOINT и возвращается вызвавшему запросу, остальные операции
+    пачки фиксируются.
+
+    Операции не должны сами вызывать commit(); побочные эффекты после
+    фиксации регистрируются через after_commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        window_ms: float = settings.write_batch_window_ms,
+        max_batch_size: int = settings.write_batch_max_size,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.metrics = WriteBatchMetrics()
+        self._queue: asyncio.Queue[_PendingWrite] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Запустить фоновый обработчик очереди."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Дождаться обработки очереди и остановить обработчик."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def submit(self, operation: WriteOperation[T]) -> T:
+        """Поставить операцию в очередь и дождаться её результата
+
+        Args:
+            operation (WriteOperation): Корутина-функция, принимающая сессию
+
+        Returns:
+            T: Результат операции после фиксации пачки
+
+        Raises:
+            Exception: Ошибка операции или фиксации пачки
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        pending = _PendingWrite(operation, future, loop.time(), current_sql_stats.get())
+        await self._queue.put(pending)
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._apply(batch)
+            except Exception as exc:  # noqa: PIE786 - обработчик не должен завершаться
+                # Непредвиденная ошибка откатила всю пачку: она отдаётся каждой
+                # операции, чтобы запросы не ждали ответа бесконечно
+                logger.exception("Write batch failed")
+                for pending in batch:
+                    if not pending.future.done():
+                        self.metrics.failed_operations += 1
+                        pending.future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _apply(self, batch: list[_PendingWrite]) -> None:
+        started_at = asyncio.get_running_loop().time()
+        self.metrics.observe_batch(
+            len(batch), [started_at - pending.enqueued_at for pending in batch]
+        )
+
+        outcomes: list[tuple[_PendingWrite, Any, BaseException | None]] = []
+        async with self.session_factory() as session:
+            try:
+                for pending in batch:
+                    callbacks = session.info.setdefault("after_commit", [])
+                    registered = len(callbacks)
+                    # Объекты предыдущих операций отсоединяются: операция не
+                    # видит их состояние, а её откат не затрагивает их ответы
+                    session.expunge_all()
+                    # SQL операции учитывается в метриках вызвавшего запроса
+                    token = current_sql_stats.set(pending.sql_stats)
+                    error: BaseException | None = None
+                    try:
+                        async with session.begin_nested():
+                            result = await pending.operation(session)
+                    except (SQLAlchemyError, HTTPException) as exc:
+                        error = exc
+                    finally:
+                        current_sql_stats.reset(token)
+                    if error is not None:
+                        del callbacks[registered:]
+                        self.metrics.failed_operations += 1
+                        outcomes.append((pending, None, error))
+                    else:
+                        outcomes.append((pending, result, None))
+                await session.commit()
+            except SQLAlchemyError as exc:
+                await session.rollback()
+                self.metrics.failed_operations += len(batch) - sum(
+                    error is not None for _, _, error in outcomes
+                )
+                outcomes = [(pending, None, exc) for pending in batch]
+
+        for pending, result, error in outcomes:
+            if pending.future.done():
+                continue
+            if error is not None:
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(result)
+
+
+write_coordinator = WriteCoordinator() if settings.write_batching else None
+
+
+async def execute_write(session: AsyncSession, operation: WriteOperation[T]) -> T:
+    """Выполнить операцию записи напрямую или через групповую фиксацию
+
+    Args:
+        session (AsyncSession): Сессия запроса (используется без группировки)
+        operation (WriteOperation): Корутина-функция, принимающая сессию
+
+    Returns:
+        T: Результат операции
+    """
+    if write_coordinator is None:
+        return await operation(session)
+    return await write_coordinator.submit(operation)
@@ -0,0 +1,106 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_core import to_json
+
+from app.config import settings
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Подписка клиента на поток изменений.
+
+    Attributes:
+        queue (asyncio.Queue[bytes]): Ограниченная очередь готовых SSE-кадров
+        dropped (bool): Клиент отключён из-за переполнения очереди; в очереди
+            остаётся только кадр reset
+    """
+
+    queue: asyncio.Queue[bytes]
+    dropped: bool = False
+
+
+@dataclass
+class BroadcasterMetrics:
+    """Счётчики рассылки изменений.
+
+    Attributes:
+        published (int): Число опубликованных событий
+        dropped_subscribers (int): Число клиентов, отключённых за отставание
+    """
+
+    published: int = 0
+    dropped_subscribers: int = 0
+
+
+class ChangeBroadcaster:
+    """Рассылка событий изменения задач подписчикам в формате SSE.
+
+    Событие сериализуется в кадр один раз и кладётся в очередь каждого
+    подписчика без ожидания. Очереди ограничены queue_size: подписчик,
+    который не успевает их разбирать, отключается (его очередь очищается
+    и получает кадр reset), поэтому медленный клиент не задерживает
+    публикацию и не накапливает память. Получив reset, клиент должен
+    заново загрузить данные.
+
+    Публикация синхронная и вызывается из after_commit в цикле событий
+    приложения.
+    """
+
+    def __init__(self, queue_size: int = settings.events_queue_size) -> None:
+        self.queue_size = queue_size
+        self.metrics = BroadcasterMetrics()
+        self._subscribers: set[Subscription] = set()
+        self._sequence = 0
+
+    @property
+    def subscribers(self) -> int:
+        """Число подключённых подписчиков."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """Подписаться на события, опубликованные после подписки."""
+        subscription = Subscription(asyncio.Queue(self.queue_size))
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Отписаться от событий."""
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Разослать событие всем подписчикам
+
+        Args:
+            event (str): Тип события (поле event SSE)
+            data (Any): JSON-совместимые данные события
+        """
+        if not self._subscribers:
+            return
+        self._sequence += 1
+        self.metrics.published += 1
+        frame = self._frame(event, to_json(data))
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+
+    def _frame(self, event: str, data: bytes) -> bytes:
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+            self._sequence,
+            event.encode(),
+            data,
+        )
+
+    def _drop(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        self.metrics.dropped_subscribers += 1
+        subscription.dropped = True
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(self._frame("reset", b"{}"))
+
+
+change_broadcaster = ChangeBroadcaster()
@@ -0,0 +1,72 @@
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics.registry import metrics_registry
+from app.metrics.sql import SqlStats, current_sql_stats
+
+
+class MetricsMiddleware:
+    """ASGI-middleware, собирающее метрики HTTP-запросов.
+
+    Для каждого запроса считает длительность, число и время SQL-запросов,
+    число строк и размер ответа, группируя их по шаблону маршрута. В ответ
+    добавляется заголовок Server-Timing с временем SQL и обработки на момент
+    отправки заголовков (у потоковых ответов SQL после этого момента
+    попадает только в /metrics).
+
+    Операции координатора групповой фиксации учитываются в запросе,
+    который их поставил в очередь; общий COMMIT пачки - только в
+    db_statements_total.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = perf_counter()
+        sql = SqlStats()
+        token = current_sql_stats.set(sql)
+        status = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = perf_counter() - started_at
+                server_timing = (
+                    f"db;dur={sql.seconds * 1000:.1f};"
+                    f'desc="queries: {sql.statements}", '
+                    f"app;dur={elapsed * 1000:.1f}"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", server_timing.encode("latin-1")),
+                ]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_sql_stats.reset(token)
+            # Шаблон пути маршрута FastAPI, префикс для Mount (/static)
+            route = scope.get("route")
+            if route is not None:
+                route_path = route.path
+            else:
+                route_path = scope.get("root_path") or "<unmatched>"
+            metrics_registry.observe_request(
+                scope["method"],
+                route_path,
+                status,
+                perf_counter() - started_at,
+                sql,
+                response_bytes,
+            )
@@ -0,0 +1,183 @@
+import math
+from dataclasses import dataclass, field
+
+from app.metrics.sql import SqlStats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Сформировать набор меток в формате Prometheus ({a="1",b="2"})."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    """Отформатировать число для текстового формата Prometheus."""
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+@dataclass
+class Histogram:
+    """Гистограмма с фиксированными границами корзин.
+
+    Attributes:
+        bounds (tuple[float, ...]): Верхние границы корзин (без +Inf)
+        counts (list[int]): Число наблюдений в каждой корзине, последняя - +Inf
+        total (float): Сумма наблюдений
+        count (int): Число наблюдений
+    """
+
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        """Учесть одно наблюдение."""
+        for position, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[position] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: dict[str, str]) -> list[str]:
+        """Отрисовать строки _bucket, _sum и _count."""
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip((*self.bounds, math.inf), self.counts):
+            cumulative += bucket_count
+            bucket_labels = {**labels, "le": format_value(float(bound))}
+            lines.append(f"{name}_bucket{format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{name}_sum{format_labels(labels)} {format_value(self.total)}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+
+@dataclass
+class RouteMetrics:
+    """Метрики одного маршрута (метод + шаблон пути).
+
+    Attributes:
+        responses (dict[int, int]): Число ответов по HTTP-статусу
+        latency (Histogram): Длительность обработки запросов в секундах
+        sql_statements (Histogram): Число SQL-запросов на HTTP-запрос
+        sql_seconds (float): Суммарное время SQL-запросов
+        sql_rows (int): Суммарное число строк SQL-запросов
+        response_bytes (int): Суммарный размер тел ответов
+    """
+
+    responses: dict[int, int] = field(default_factory=dict)
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    sql_statements: Histogram = field(
+        default_factory=lambda: Histogram(SQL_STATEMENT_BUCKETS)
+    )
+    sql_seconds: float = 0.0
+    sql_rows: int = 0
+    response_bytes: int = 0
+
+
+class MetricsRegistry:
+    """Хранилище метрик HTTP-запросов в памяти процесса."""
+
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        seconds: float,
+        sql: SqlStats,
+        response_bytes: int,
+    ) -> None:
+        """Учесть завершённый HTTP-запрос
+
+        Args:
+            method (str): HTTP-метод
+            route (str): Шаблон пути маршрута (например, /api/tasks/{task_id})
+            status (int): HTTP-статус ответа
+            seconds (float): Длительность обработки
+            sql (SqlStats): SQL-запросы, выполненные при обработке
+            response_bytes (int): Размер тела ответа
+        """
+        metrics = self.routes.setdefault((method, route), RouteMetrics())
+        metrics.responses[status] = metrics.responses.get(status, 0) + 1
+        metrics.latency.observe(seconds)
+        metrics.sql_statements.observe(sql.statements)
+        metrics.sql_seconds += sql.seconds
+        metrics.sql_rows += sql.rows
+        metrics.response_bytes += response_bytes
+
+    def render(self) -> list[str]:
+        """Отрисовать метрики маршрутов в текстовом формате Prometheus."""
+        lines = [
+            "# HELP http_requests_total Number of HTTP requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route), metrics in sorted(self.routes.items()):
+            for status, count in sorted(metrics.responses.items()):
+                labels = {"method": method, "route": route, "status": str(status)}
+                lines.append(f"http_requests_total{format_labels(labels)} {count}")
+
+        histograms = (
+            (
+                "http_request_duration_seconds",
+                "HTTP request latency in seconds.",
+                "latency",
+            ),
+            (
+                "http_request_sql_statements",
+                "Number of SQL statements executed per HTTP request.",
+                "sql_statements",
+            ),
+        )
+        for name, description, attribute in histograms:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+            for (method, route), metrics in sorted(self.routes.items()):
+                histogram: Histogram = getattr(metrics, attribute)
+                lines += histogram.render(name, {"method": method, "route": route})
+
+        counters = (
+            (
+                "http_request_sql_seconds_total",
+                "Time spent in SQL statements.",
+                "sql_seconds",
+            ),
+            (
+                "http_request_sql_rows_total",
+                "Rows returned or affected by SQL statements.",
+                "sql_rows",
+            ),
+            (
+                "http_response_bytes_total",
+                "Size of HTTP response bodies in bytes.",
+                "response_bytes",
+            ),
+        )
+        for name, description, attribute in counters:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            for (method, route), metrics in sorted(self.routes.items()):
+                labels = {"method": method, "route": route}
+                value = format_value(getattr(metrics, attribute))
+                lines.append(f"{name}{format_labels(labels)} {value}")
+        return lines
+
+
+metrics_registry = MetricsRegistry()
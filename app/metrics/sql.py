@@ -0,0 +1,66 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class SqlStats:
+    """Счётчики SQL-запросов.
+
+    Attributes:
+        statements (int): Число выполненных запросов
+        seconds (float): Суммарное время выполнения запросов
+        rows (int): Число строк, возвращённых SELECT или изменённых DML
+    """
+
+    statements: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+
+    def observe(self, seconds: float, rows: int) -> None:
+        """Учесть один выполненный запрос."""
+        self.statements += 1
+        self.seconds += seconds
+        self.rows += rows
+
+
+current_sql_stats: ContextVar[SqlStats | None] = ContextVar(
+    "current_sql_stats", default=None
+)
+"""Счётчики SQL текущего HTTP-запроса (устанавливаются MetricsMiddleware)."""
+
+sql_totals = SqlStats()
+"""Счётчики всех запросов процесса, включая выполненные вне HTTP-запросов."""
+
+
+def _returned_rows(cursor: Any) -> int:
+    # Для SELECT rowcount в SQLite равен -1, но адаптер aiosqlite уже выбрал
+    # строки в буфер; строки серверного курсора (stream) здесь не учитываются.
+    if cursor.rowcount >= 0:
+        return int(cursor.rowcount)
+    return len(getattr(cursor, "_rows", ()))
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключить подсчёт числа, времени и строк SQL-запросов к движку.
+
+    Args:
+        engine (AsyncEngine): Движок SQLAlchemy
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_timer(conn: Any, cursor: Any, *args: Any) -> None:
+        conn.info.setdefault("query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _observe(conn: Any, cursor: Any, *args: Any) -> None:
+        seconds = perf_counter() - conn.info["query_started_at"].pop()
+        rows = _returned_rows(cursor)
+        sql_totals.observe(seconds, rows)
+        stats = current_sql_stats.get()
+        if stats is not None:
+            stats.observe(seconds, rows)
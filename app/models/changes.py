@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, false, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+
+class TaskChange(Base):
+    """Журнал изменений задач для дельта-синхронизации клиентов.
+
+    Строки пишутся триггерами на tasks и task_assignees (см. миграцию),
+    поэтому в журнал попадает любая запись, включая bulk-вставки.
+    На задачу хранится одна строка: каждое изменение заменяет её строкой
+    с новым seq, и журнал не растёт от повторных правок одной задачи.
+    Удаление задачи оставляет надгробие (deleted), которое удаляется
+    при уплотнении журнала.
+
+    Attributes:
+        seq (int): Монотонно растущий номер изменения (AUTOINCREMENT,
+            номера не переиспользуются)
+        task_id (int): ID изменённой задачи
+        deleted (bool): Задача удалена
+        changed_at (datetime): Время изменения
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    task_id: Mapped[int] = mapped_column(unique=True, nullable=False)
+    deleted: Mapped[bool] = mapped_column(default=False, server_default=false())
+    changed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+
+
+class ChangeLogState(Base):
+    """Состояние журнала изменений (одна строка).
+
+    Attributes:
+        id (int): Всегда 1
+        horizon_seq (int): Наибольший seq удалённых при уплотнении надгробий;
+            курсор меньше горизонта мог пропустить удаления
+    """
+
+    __tablename__ = "change_log_state"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    horizon_seq: Mapped[int] = mapped_column(nullable=False, default=0)
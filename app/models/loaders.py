@@ -0,0 +1,30 @@
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.tasks import Task, TaskAssignee
+
+LOADER_PROFILES: dict[str, tuple[ORMOption, ...]] = {
+    # Карточка задачи: автор и исполнители с пользователями, без детей и родителя
+    "detail": (
+        selectinload(Task.author),
+        selectinload(Task.assignees).selectinload(TaskAssignee.user),
+    ),
+}
+
+
+def loader_options(profile: str) -> tuple[ORMOption, ...]:
+    """Получить опции загрузки связей для именованного профиля
+
+    Модели по умолчанию не загружают связи (UNPLANNED_LAZY), поэтому каждый
+    обработчик явно выбирает профиль под форму своего ответа.
+
+    Args:
+        profile (str): Имя профиля: "detail"
+
+    Returns:
+        tuple[ORMOption, ...]: Опции для select(...).options(*...)
+
+    Raises:
+        KeyError: Неизвестный профиль
+    """
+    return LOADER_PROFILES[profile]
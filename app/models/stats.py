@@ -0,0 +1,40 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.database import Base
+
+STAT_TOTAL = "total"
+STAT_STATUS = "status"
+STAT_AUTHOR = "author"
+STAT_ASSIGNEE = "assignee"
+STAT_OPEN_DUE_DAY = "open_due_day"
+CLOSED_STATUS = "completed"
+
+
+class TaskStat(Base):
+    """Счётчик задач в разрезе одного измерения.
+
+    Счётчики обновляются триггерами на tasks и task_assignees (см. миграцию)
+    в той же транзакции, что и сами строки, поэтому всегда согласованы
+    с данными. Полная пересборка - app.database.stats.
+
+    Измерения:
+    - total: все задачи (key - пустая строка)
+    - status: задачи по статусу
+    - author: задачи по ID автора
+    - assignee: назначения по ID исполнителя
+    - open_due_day: незавершённые задачи по дню срока (YYYY-MM-DD)
+
+    Attributes:
+        dimension (str): Измерение
+        key (str): Значение измерения
+        count (int): Число задач
+    """
+
+    __tablename__ = "task_stats"
+    # Счётчики читаются и обновляются только по первичному ключу
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    dimension: Mapped[str] = mapped_column(String(20), primary_key=True)
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -1,10 +1,10 @@
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import TIMESTAMP, ForeignKey, String, func
+from sqlalchemy import TIMESTAMP, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database.database import Base
+from app.database.database import UNPLANNED_LAZY, Base
 
 
 class Task(Base):
@@ -17,6 +17,9 @@ class Task(Base):
         created_at (datetime): Время создания (автоматическое)
         end_date (datetime): Срок выполнения
         status (str): Статус задачи (по умолчанию 'pending')
+        descendant_count (int): Число потомков задачи на всех уровнях
+        earliest_open_end_date (datetime | None): Ближайший срок среди
+            незавершённых потомков
         parent_id (int | None): ID родительской задачи (если есть)
         parent (Task | None): Родительская задача
         children (List[Task]): Список подзадач
@@ -25,6 +28,12 @@ class Task(Base):
     """
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_parent_id_id", "parent_id", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_author_id_id", "author_id", "id"),
+        Index("ix_tasks_end_date_id", "end_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -36,20 +45,24 @@ class Task(Base):
         TIMESTAMP(timezone=True), nullable=False
     )
     status: Mapped[str] = mapped_column(String(50), default="pending")
+    descendant_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    earliest_open_end_date: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True)
+    )
 
     parent_id: Mapped[int | None] = mapped_column(ForeignKey("tasks.id"))
     parent: Mapped["Task | None"] = relationship(
-        "Task", remote_side=[id], back_populates="children", lazy="selectin"
+        "Task", remote_side=[id], back_populates="children", lazy=UNPLANNED_LAZY
     )
     children: Mapped[List["Task"]] = relationship(
-        "Task", back_populates="parent", lazy="selectin", cascade="all, delete"
+        "Task", back_populates="parent", lazy=UNPLANNED_LAZY
     )
 
     author_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    author: Mapped["User"] = relationship(back_populates="created_tasks", lazy="selectin")  # type: ignore # noqa
+    author: Mapped["User"] = relationship(back_populates="created_tasks", lazy=UNPLANNED_LAZY)  # type: ignore # noqa
 
     assignees: Mapped[List["TaskAssignee"]] = relationship(
-        back_populates="task", lazy="selectin", cascade="all, delete"
+        back_populates="task", lazy=UNPLANNED_LAZY
     )
 
 
@@ -66,6 +79,7 @@ class TaskAssignee(Base):
     """
 
     __tablename__ = "task_assignees"
+    __table_args__ = (Index("ix_task_assignees_task_id_user_id", "task_id", "user_id"),)
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), primary_key=True)
@@ -74,5 +88,51 @@ class TaskAssignee(Base):
         TIMESTAMP(timezone=True), server_default=func.now()
     )
 
-    user: Mapped["User"] = relationship(back_populates="assigned_tasks", lazy="selectin")  # type: ignore # noqa
-    task: Mapped["Task"] = relationship(back_populates="assignees", lazy="selectin")
+    user: Mapped["User"] = relationship(back_populates="assigned_tasks", lazy=UNPLANNED_LAZY)  # type: ignore # noqa
+    task: Mapped["Task"] = relationship(back_populates="assignees", lazy=UNPLANNED_LAZY)
+
+
+class TaskClosure(Base):
+    """Таблица замыкания иерархии задач.
+
+    Хранит пару (предок, потомок) для каждой задачи и каждого её предка,
+    включая саму задачу с глубиной 0. Позволяет получать поддерево, цепочку
+    предков и проверять вложенность одним индексированным запросом.
+
+    Attributes:
+        ancestor_id (int): ID задачи-предка
+        descendant_id (int): ID задачи-потомка
+        depth (int): Расстояние от предка до потомка
+    """
+
+    __tablename__ = "task_closure"
+    __table_args__ = (
+        Index("ix_task_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), primary_key=True)
+    depth: Mapped[int] = mapped_column(nullable=False)
+
+
+class TaskStatusRollup(Base):
+    """Число потомков задачи в каждом статусе.
+
+    Вместе с Task.descendant_count и Task.earliest_open_end_date образует
+    сводку поддерева. Сводки обновляются по цепочке предков при создании,
+    удалении, переносе задачи и смене её статуса или срока (см.
+    app.routers.task_tree.add_to_rollups), строки с нулём удаляются.
+
+    Attributes:
+        task_id (int): ID задачи-предка
+        status (str): Статус потомков
+        count (int): Число потомков в этом статусе
+    """
+
+    __tablename__ = "task_status_rollups"
+    # Сводки читаются и обновляются только по первичному ключу
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(50), primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
@@ -3,7 +3,7 @@ from typing import List
 from sqlalchemy import String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database.database import Base
+from app.database.database import UNPLANNED_LAZY, Base
 
 
 class User(Base):
@@ -29,5 +29,5 @@ class User(Base):
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     position: Mapped[str] = mapped_column(String(200), nullable=True)
 
-    created_tasks: Mapped[List["Task"]] = relationship(back_populates="author", lazy="selectin")  # type: ignore # noqa
-    assigned_tasks: Mapped[List["TaskAssignee"]] = relationship(back_populates="user", lazy="selectin")  # type: ignore # noqa
+    created_tasks: Mapped[List["Task"]] = relationship(back_populates="author", lazy=UNPLANNED_LAZY)  # type: ignore # noqa
+    assigned_tasks: Mapped[List["TaskAssignee"]] = relationship(back_populates="user", lazy=UNPLANNED_LAZY)  # type: ignore # noqa
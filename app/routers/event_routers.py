@@ -0,0 +1,65 @@
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.events.broadcaster import change_broadcaster
+
+router = APIRouter(prefix="/api")
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+KEEPALIVE_SECONDS = 15.0
+RECONNECT_DELAY_MS = 3000
+
+
+async def event_stream() -> AsyncIterator[bytes]:
+    """Отдавать кадры SSE подписки до отключения клиента
+
+    Подписка создаётся при первом чтении и снимается при отключении клиента
+    или после кадра reset. При отсутствии событий отправляется комментарий
+    keepalive, чтобы прокси не закрывали простаивающее соединение.
+
+    Yields:
+        bytes: Кадр SSE
+    """
+    subscription = change_broadcaster.subscribe()
+    try:
+        yield b"retry: %d\n\n" % RECONNECT_DELAY_MS
+        while True:
+            try:
+                frame = await asyncio.wait_for(
+                    subscription.queue.get(), KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            yield frame
+            if subscription.dropped:
+                return
+    finally:
+        change_broadcaster.unsubscribe(subscription)
+
+
+@router.get("/events")
+async def get_events() -> StreamingResponse:
+    """Подписаться на поток изменений задач (Server-Sent Events)
+
+    События публикуются после фиксации транзакции:
+    - created: {"tasks": [...]} - новые задачи (ID автора и исполнителей)
+    - updated: {"id": ..., "changes": {...}} - изменённые поля задачи
+    - deleted: {"ids": [...]} - удалённые задачи вместе с подзадачами
+    - reset: клиент не успевал читать события и отключён, данные
+      нужно загрузить заново
+
+    Returns:
+        StreamingResponse: Поток text/event-stream
+
+    Status Codes:
+        200 OK: Поток открыт
+    """
+    return StreamingResponse(
+        event_stream(),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
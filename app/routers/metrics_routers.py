@@ -0,0 +1,97 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database.write_queue import write_coordinator
+from app.events.broadcaster import change_broadcaster
+from app.metrics.registry import format_labels, format_value, metrics_registry
+from app.metrics.sql import sql_totals
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render_sql_totals() -> list[str]:
+    """Отрисовать счётчики всех SQL-запросов процесса."""
+    return [
+        "# HELP db_statements_total SQL statements executed by the process.",
+        "# TYPE db_statements_total counter",
+        f"db_statements_total {sql_totals.statements}",
+        "# HELP db_statement_seconds_total Time spent in SQL statements.",
+        "# TYPE db_statement_seconds_total counter",
+        f"db_statement_seconds_total {format_value(sql_totals.seconds)}",
+        "# HELP db_rows_total Rows returned or affected by SQL statements.",
+        "# TYPE db_rows_total counter",
+        f"db_rows_total {sql_totals.rows}",
+    ]
+
+
+def render_write_batch_metrics() -> list[str]:
+    """Отрисовать метрики групповой фиксации, если она включена."""
+    if write_coordinator is None:
+        return []
+    metrics = write_coordinator.metrics
+    queue_wait = format_value(metrics.queue_wait_seconds)
+    max_queue_wait = format_value(metrics.max_queue_wait_seconds)
+    lines = [
+        "# HELP write_batch_operations_total Write operations processed in batches.",
+        "# TYPE write_batch_operations_total counter",
+        f"write_batch_operations_total {metrics.operations}",
+        "# HELP write_batch_failed_operations_total"
+        " Batched write operations that failed.",
+        "# TYPE write_batch_failed_operations_total counter",
+        f"write_batch_failed_operations_total {metrics.failed_operations}",
+        "# HELP write_batch_size Number of write operations per committed batch.",
+        "# TYPE write_batch_size histogram",
+    ]
+    for bound, count in metrics.batch_size_buckets.items():
+        labels = format_labels({"le": format_value(float(bound))})
+        lines.append(f"write_batch_size_bucket{labels} {count}")
+    lines += [
+        f'write_batch_size_bucket{{le="+Inf"}} {metrics.batches}',
+        f"write_batch_size_sum {metrics.operations}",
+        f"write_batch_size_count {metrics.batches}",
+        "# HELP write_batch_queue_wait_seconds_total"
+        " Time operations waited in the queue.",
+        "# TYPE write_batch_queue_wait_seconds_total counter",
+        f"write_batch_queue_wait_seconds_total {queue_wait}",
+        "# HELP write_batch_queue_wait_seconds_max Longest queue wait observed.",
+        "# TYPE write_batch_queue_wait_seconds_max gauge",
+        f"write_batch_queue_wait_seconds_max {max_queue_wait}",
+    ]
+    return lines
+
+
+def render_event_metrics() -> list[str]:
+    """Отрисовать метрики потока изменений."""
+    metrics = change_broadcaster.metrics
+    return [
+        "# HELP events_subscribers Connected change feed subscribers.",
+        "# TYPE events_subscribers gauge",
+        f"events_subscribers {change_broadcaster.subscribers}",
+        "# HELP events_published_total Change events published to subscribers.",
+        "# TYPE events_published_total counter",
+        f"events_published_total {metrics.published}",
+        "# HELP events_dropped_subscribers_total"
+        " Subscribers dropped for falling behind.",
+        "# TYPE events_dropped_subscribers_total counter",
+        f"events_dropped_subscribers_total {metrics.dropped_subscribers}",
+    ]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Получить метрики приложения в текстовом формате Prometheus
+
+    Returns:
+        PlainTextResponse: Метрики маршрутов (число запросов, латентность,
+            число и время SQL-запросов, строки, размер ответов), общие
+            счётчики SQL, метрики групповой фиксации записей и потока
+            изменений
+
+    Status Codes:
+        200 OK: Успешный ответ
+    """
+    lines = metrics_registry.render() + render_sql_totals()
+    lines += render_write_batch_metrics() + render_event_metrics()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_MEDIA_TYPE)
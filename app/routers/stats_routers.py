@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_read_db
+from app.database.stats import load_task_stats
+from app.shemas.stats_schemas import TaskStatsResponse
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+async def get_stats(db: AsyncSession = Depends(get_read_db)) -> dict[str, Any]:
+    """Получить сводную статистику задач для дашбордов
+
+    Счётчики ведутся в той же транзакции, что и изменения задач, поэтому
+    согласованы с данными; чтение не зависит от числа задач. Ответ
+    не кэшируется: число просроченных задач меняется со временем.
+
+    Args:
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        TaskStatsResponse: Число задач всего, по статусам, авторам,
+            исполнителям и число просроченных
+
+    Status Codes:
+        200 OK: Успешный ответ
+    """
+    return await load_task_stats(db, datetime.now())
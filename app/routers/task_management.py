@@ -1,12 +1,115 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable
+
 from fastapi import HTTPException
-from sqlalchemy import delete, select
+from sqlalchemy import ColumnElement, delete, insert, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.models.tasks import Task, TaskAssignee
+from app.cache.response_cache import render_rows, response_cache, task_tag
+from app.cache.user_cache import user_cache
+from app.database.change_log import change_log_horizon
+from app.database.database import (
+    AsyncReadSessionLocal,
+    after_commit,
+    lock_for_write,
+)
+from app.events.broadcaster import change_broadcaster
+from app.models.changes import TaskChange
+from app.models.loaders import loader_options
+from app.models.tasks import Task, TaskAssignee, TaskClosure, TaskStatusRollup
 from app.models.users import User
-from app.shemas.task_patch_schemas import TaskUpdate
-from app.shemas.task_post_schemas import TaskCreate
+from app.routers.task_tree import (
+    DEFAULT_TASK_FIELDS,
+    REQUIRED_TASK_FIELDS,
+    TASK_DATE_FORMAT,
+    TASK_FIELDS,
+    TaskRow,
+    add_to_rollups,
+    formatted_date,
+    insert_closure_rows,
+    is_in_subtree,
+    load_task_rows,
+    move_subtree,
+    remove_from_rollups,
+    subtree_ids,
+    tree_roots,
+)
+from app.shemas.task_get_schemas import TaskFieldsParams, TaskListParams
+from app.shemas.task_patch_schemas import (
+    TaskBatchOutcome,
+    TaskBatchUpdateItem,
+    TaskUpdate,
+)
+from app.shemas.task_post_schemas import (
+    TaskBatchError,
+    TaskBatchItem,
+    TaskBatchResult,
+    TaskCreate,
+)
+
+STREAM_BATCH_SIZE = 500
+
+
+def _event_value(value: Any) -> Any:
+    # Даты в событиях в том же формате, что и в ответах API
+    return value.strftime(TASK_DATE_FORMAT) if isinstance(value, datetime) else value
+
+
+def created_task_event(
+    task_id: int,
+    created_at: datetime,
+    parent_id: int | None,
+    task_data: TaskCreate | TaskBatchItem,
+) -> TaskRow:
+    """Собрать данные созданной задачи для события created
+
+    Args:
+        task_id (int): ID созданной задачи
+        created_at (datetime): Время создания
+        parent_id (int | None): ID родителя (в пакете - уже разрешённый parent_ref)
+        task_data (TaskCreate | TaskBatchItem): Данные запроса
+
+    Returns:
+        TaskRow: Поля задачи с ID автора и исполнителей вместо вложенных
+            пользователей
+    """
+    return {
+        "id": task_id,
+        "title": task_data.title,
+        "description": task_data.description,
+        "parent_id": parent_id,
+        "created_at": _event_value(created_at),
+        "end_date": _event_value(task_data.end_date),
+        "author_id": task_data.author_id,
+        "status": "pending",
+        "assignee_user_ids": list(dict.fromkeys(task_data.assignee_user_ids or [])),
+    }
+
+
+def task_projection(params: TaskFieldsParams) -> tuple[frozenset[str], int | None]:
+    """Разобрать выборочные поля и глубину дерева задач
+
+    Args:
+        params (TaskFieldsParams): Параметры fields и depth запроса
+
+    Returns:
+        tuple[frozenset[str], int | None]: Поля для load_task_rows и глубина
+            подзадач (None - без ограничения; 0, если children не запрошены)
+
+    Raises:
+        HTTPException(400): Если запрошены неизвестные поля
+    """
+    fields = DEFAULT_TASK_FIELDS
+    if params.fields is not None:
+        requested = frozenset(params.fields.split(","))
+        unknown = sorted(requested - set(TASK_FIELDS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+        fields = REQUIRED_TASK_FIELDS | requested
+    if params.depth is not None:
+        fields |= {"children_count"}
+    return fields, params.depth if "children" in fields else 0
 
 
 async def get_task_by_id(task_id: int, session: AsyncSession) -> Task | None:
@@ -20,37 +123,359 @@ async def get_task_by_id(task_id: int, session: AsyncSession) -> Task | None:
         Task | None: Задача с автором и списком назначенных пользователей, или None если не найдена
     """
     task = await session.execute(
-        select(Task)
-        .options(
-            selectinload(Task.author),
-            selectinload(Task.assignees).selectinload(TaskAssignee.user),
-        )
-        .where(Task.id == task_id)
+        select(Task).options(*loader_options("detail")).where(Task.id == task_id)
     )
     return task.scalars().first()
 
 
-async def get_all_tasks(session: AsyncSession) -> list[Task]:
-    """Получить список корневых задач с подзадачами
+async def get_task_detail(task_id: int, session: AsyncSession) -> TaskRow | None:
+    """Получить задачу по ID в форме TaskResponseById без ORM-объектов
 
     Args:
+        task_id (int): ID запрашиваемой задачи
         session (AsyncSession): Асинхронная сессия SQLAlchemy
 
     Returns:
-        List[Task]: Список задач с подзадачами, авторами и назначенными пользователями
+        TaskRow | None: Словарь задачи с автором, исполнителями и сводкой
+            поддерева, готовый для render_rows, или None если задача не найдена
     """
-    result = await session.execute(
-        select(Task).options(
-            selectinload(Task.children),
-            selectinload(Task.author),
-            selectinload(Task.assignees).selectinload(TaskAssignee.user),
+    task = (
+        await session.execute(
+            select(
+                Task.id,
+                Task.title,
+                Task.description,
+                Task.parent_id,
+                formatted_date(Task.created_at).label("created_at"),
+                formatted_date(Task.end_date).label("end_date"),
+                Task.author_id,
+                Task.descendant_count,
+                formatted_date(Task.earliest_open_end_date).label(
+                    "earliest_open_end_date"
+                ),
+            ).where(Task.id == task_id)
+        )
+    ).first()
+    if task is None:
+        return None
+
+    assignees = (
+        await session.execute(
+            select(TaskAssignee.user_id, TaskAssignee.assignee_status).where(
+                TaskAssignee.task_id == task_id
+            )
         )
+    ).all()
+    rollups = await session.execute(
+        select(TaskStatusRollup.status, TaskStatusRollup.count)
+        .where(TaskStatusRollup.task_id == task_id)
+        .order_by(TaskStatusRollup.status)
     )
+    users = await user_cache.get_many(
+        session, {task.author_id, *(row.user_id for row in assignees)}
+    )
+
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "parent_id": task.parent_id,
+        "created_at": task.created_at,
+        "end_date": task.end_date,
+        "author": users[task.author_id],
+        "assignees": [
+            {"user": users[row.user_id], "assignee_status": row.assignee_status}
+            for row in assignees
+        ],
+        "descendant_count": task.descendant_count,
+        "descendant_statuses": {row.status: row.count for row in rollups},
+        "earliest_open_end_date": task.earliest_open_end_date,
+    }
+
+
+async def get_all_tasks(
+    session: AsyncSession,
+    fields: frozenset[str] = DEFAULT_TASK_FIELDS,
+    depth: int | None = None,
+) -> list[TaskRow]:
+    """Получить список корневых задач с подзадачами
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        fields (frozenset[str]): Поля задач, см. task_projection
+        depth (int | None): Глубина подзадач (None - всё дерево)
+
+    Returns:
+        list[TaskRow]: Список задач в форме TaskResponse с подзадачами,
+            авторами и назначенными пользователями
+
+    Note:
+        Дерево собирается за фиксированное число запросов, см. load_task_rows
+    """
+    task_ids = None
+    if depth is not None:
+        task_ids = subtree_ids(select(Task.id).where(Task.parent_id.is_(None)), depth)
+    index = await load_task_rows(session, task_ids, fields=fields)
+    return tree_roots(index)
+
+
+def task_list_conditions(params: TaskListParams) -> list[ColumnElement[bool]]:
+    """Собрать условия WHERE для выборки задач списка
+
+    Args:
+        params (TaskListParams): Фильтры и параметры пагинации
+
+    Returns:
+        list[ColumnElement[bool]]: Условия для select(Task)
+    """
+    conditions = [
+        (
+            Task.parent_id.is_(None)
+            if params.parent_id is None
+            else Task.parent_id == params.parent_id
+        )
+    ]
+    if params.status is not None:
+        conditions.append(Task.status == params.status)
+    if params.author_id is not None:
+        conditions.append(Task.author_id == params.author_id)
+    if params.assignee_id is not None:
+        conditions.append(
+            Task.id.in_(
+                select(TaskAssignee.task_id).where(
+                    TaskAssignee.user_id == params.assignee_id
+                )
+            )
+        )
+    if params.end_date_from is not None:
+        conditions.append(Task.end_date >= params.end_date_from)
+    if params.end_date_to is not None:
+        conditions.append(Task.end_date <= params.end_date_to)
+    if params.cursor is not None:
+        conditions.append(Task.id > params.cursor)
+
+    return conditions
 
-    all_tasks = result.scalars().all()
-    finale_tasks = [task for task in all_tasks if task.parent_id is None]
 
-    return finale_tasks
+async def get_task_subtree(
+    task_id: int,
+    max_depth: int | None,
+    session: AsyncSession,
+    fields: frozenset[str] = DEFAULT_TASK_FIELDS,
+) -> TaskRow | None:
+    """Получить задачу с поддеревом ограниченной глубины
+
+    Ветка выбирается по таблице замыкания, поэтому загружается
+    только она, а не весь лес задач.
+
+    Args:
+        task_id (int): ID корня ветки
+        max_depth (int | None): Глубина поддерева (None - без ограничения)
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        fields (frozenset[str]): Поля задач, см. task_projection
+
+    Returns:
+        TaskRow | None: Задача в форме TaskResponse с вложенными подзадачами
+            или None, если не найдена
+    """
+    anchor = select(Task.id).where(Task.id == task_id)
+    index = await load_task_rows(session, subtree_ids(anchor, max_depth), fields=fields)
+    return index.get(task_id)
+
+
+async def get_tasks_page(
+    params: TaskListParams,
+    session: AsyncSession,
+    fields: frozenset[str] = DEFAULT_TASK_FIELDS,
+    depth: int | None = None,
+) -> tuple[list[TaskRow], int | None]:
+    """Получить страницу задач с фильтрами и keyset-пагинацией
+
+    Задачи выбираются по индексам в порядке возрастания ID, страница
+    продолжается условием id > cursor, поэтому глубокие страницы стоят
+    столько же, сколько первая.
+
+    Args:
+        params (TaskListParams): Фильтры и параметры пагинации
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        fields (frozenset[str]): Поля задач, см. task_projection
+        depth (int | None): Глубина подзадач (None - поддеревья целиком)
+
+    Returns:
+        tuple[list[TaskRow], int | None]: Задачи страницы с поддеревьями и курсор
+            следующей страницы (None, если страница последняя)
+    """
+    conditions = task_list_conditions(params)
+    stmt = select(Task.id).where(*conditions).order_by(Task.id)
+    if params.limit is not None:
+        stmt = stmt.limit(params.limit + 1)
+    page_ids = (await session.execute(stmt)).scalars().all()
+    if not page_ids:
+        return [], None
+
+    next_cursor = None
+    if params.limit is not None and len(page_ids) > params.limit:
+        page_ids = page_ids[: params.limit]
+        next_cursor = page_ids[-1]
+
+    anchor = select(Task.id).where(*conditions, Task.id <= page_ids[-1])
+    index = await load_task_rows(session, subtree_ids(anchor, depth), fields=fields)
+    return [index[task_id] for task_id in page_ids], next_cursor
+
+
+async def get_task_changes(since: int, limit: int, session: AsyncSession) -> TaskRow:
+    """Получить изменения задач после курсора журнала изменений
+
+    Читает до limit записей журнала с seq > since и загружает текущее
+    состояние изменённых задач через load_task_rows, поэтому стоимость
+    зависит от числа изменений, а не от размера дерева. Задача, удалённая
+    после чтения журнала, пропускается: её надгробие придёт со следующим
+    курсором.
+
+    Args:
+        since (int): Курсор (seq последнего учтённого изменения)
+        limit (int): Максимум записей журнала в ответе
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        TaskRow: Словарь в форме TaskChangesResponse
+
+    Raises:
+        HTTPException(410): Если курсор старше горизонта уплотнённого журнала
+    """
+    if since < await change_log_horizon(session):
+        raise HTTPException(
+            status_code=410, detail="Cursor is older than the change log horizon"
+        )
+
+    entries = (
+        await session.execute(
+            select(TaskChange.seq, TaskChange.task_id, TaskChange.deleted)
+            .where(TaskChange.seq > since)
+            .order_by(TaskChange.seq)
+            .limit(limit + 1)
+        )
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    changed_ids = [entry.task_id for entry in entries if not entry.deleted]
+    index = {}
+    if changed_ids:
+        index = await load_task_rows(
+            session, select(Task.id).where(Task.id.in_(changed_ids)), nested=False
+        )
+    return {
+        "changed": [index[task_id] for task_id in changed_ids if task_id in index],
+        "deleted": [entry.task_id for entry in entries if entry.deleted],
+        "cursor": entries[-1].seq if entries else since,
+        "has_more": has_more,
+    }
+
+
+async def stream_task_tree(
+    params: TaskListParams,
+    fields: frozenset[str] = DEFAULT_TASK_FIELDS,
+    depth: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Потоково сериализовать дерево задач в формате NDJSON
+
+    Корневые задачи читаются серверным курсором пачками по STREAM_BATCH_SIZE,
+    для каждой пачки поддеревья загружаются через load_task_rows, а каждое
+    поддерево отдаётся отдельной строкой JSON сразу после сериализации.
+    Строки не попадают в identity map сессии, поэтому потребление памяти
+    не зависит от размера таблицы.
+
+    Сессия открывается внутри генератора, так как ответ отправляется уже
+    после завершения зависимостей обработчика.
+
+    Args:
+        params (TaskListParams): Фильтры выборки корневых задач (limit
+            ограничивает общее число корней)
+        fields (frozenset[str]): Поля задач, см. task_projection
+        depth (int | None): Глубина подзадач (None - поддеревья целиком)
+
+    Yields:
+        bytes: Строка NDJSON с поддеревом одной корневой задачи
+    """
+    conditions = task_list_conditions(params)
+    stmt = select(Task.id).where(*conditions).order_by(Task.id)
+    if params.limit is not None:
+        stmt = stmt.limit(params.limit)
+
+    async with AsyncReadSessionLocal() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for batch in result.scalars().partitions():
+            anchor = select(Task.id).where(Task.id.in_(batch))
+            index = await load_task_rows(
+                session, subtree_ids(anchor, depth), fields=fields
+            )
+            for task_id in batch:
+                yield render_rows(index[task_id]) + b"\n"
+
+
+async def missing_user_ids(session: AsyncSession, user_ids: Iterable[int]) -> list[int]:
+    """Найти несуществующих пользователей одним IN-запросом
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        user_ids (Iterable[int]): Проверяемые ID пользователей
+
+    Returns:
+        list[int]: Отсутствующие ID по возрастанию
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return []
+    known = await session.execute(select(User.id).where(User.id.in_(user_ids)))
+    return sorted(user_ids - set(known.scalars()))
+
+
+async def sync_task_assignees(
+    session: AsyncSession, task_id: int, current: set[int], user_ids: Iterable[int]
+) -> bool:
+    """Привести исполнителей задачи к заданному набору по разности множеств
+
+    Новые пользователи проверяются одним IN-запросом, затем вставляются
+    только добавленные строки и удаляются только снятые. У оставшихся
+    исполнителей сохраняются assigned_at и assignee_status.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_id (int): ID задачи
+        current (set[int]): Текущие ID исполнителей
+        user_ids (Iterable[int]): Требуемые ID исполнителей (пустой набор
+            снимает всех)
+
+    Returns:
+        bool: Изменился ли состав исполнителей
+
+    Raises:
+        HTTPException(404): Если добавляемые пользователи не найдены
+    """
+    target = dict.fromkeys(user_ids)
+    added = [user_id for user_id in target if user_id not in current]
+    removed = [user_id for user_id in current if user_id not in target]
+
+    missing = await missing_user_ids(session, added)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Assignees not found: {missing}")
+
+    if removed:
+        await session.execute(
+            delete(TaskAssignee)
+            .where(TaskAssignee.task_id == task_id, TaskAssignee.user_id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    if added:
+        # Параллельный запрос мог уже добавить того же исполнителя
+        await session.execute(
+            sqlite_insert(TaskAssignee).on_conflict_do_nothing(),
+            [{"task_id": task_id, "user_id": user_id} for user_id in added],
+        )
+    return bool(added or removed)
 
 
 async def create_task(task_data: TaskCreate, session: AsyncSession) -> Task:
@@ -64,11 +489,19 @@ async def create_task(task_data: TaskCreate, session: AsyncSession) -> Task:
         Task: Созданная задача
 
     Raises:
-        HTTPException(404): Если автор не найден
+        HTTPException(404): Если автор, исполнители или родительская задача
+            не найдены
     """
-    author = await session.get(User, task_data.author_id)
-    if not author:
+    assignee_ids = list(dict.fromkeys(task_data.assignee_user_ids or []))
+    missing = await missing_user_ids(session, {task_data.author_id, *assignee_ids})
+    if task_data.author_id in missing:
         raise HTTPException(status_code=404, detail="User not found")
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Assignees not found: {missing}")
+    if task_data.parent_id is not None:
+        parent = select(Task.id).where(Task.id == task_data.parent_id)
+        if await session.scalar(parent) is None:
+            raise HTTPException(404, detail="Parent task not found")
 
     new_task = Task(
         title=task_data.title,
@@ -80,22 +513,216 @@ async def create_task(task_data: TaskCreate, session: AsyncSession) -> Task:
 
     session.add(new_task)
     await session.flush()
+    await insert_closure_rows(session, [new_task.id])
+    ancestor_ids = await add_to_rollups(
+        session, select(Task.id).where(Task.id == new_task.id)
+    )
 
     assignees = [
-        TaskAssignee(task_id=new_task.id, user_id=user_id)
-        for user_id in task_data.assignee_user_ids  # type: ignore
+        TaskAssignee(task_id=new_task.id, user_id=user_id) for user_id in assignee_ids
     ]
 
     session.add_all(assignees)
-    await session.commit()
+    event = created_task_event(
+        new_task.id, new_task.created_at, new_task.parent_id, task_data
+    )
+    after_commit(
+        session,
+        lambda: response_cache.invalidate(
+            "tasks", *(task_tag(ancestor_id) for ancestor_id in ancestor_ids)
+        ),
+    )
+    after_commit(
+        session, lambda: change_broadcaster.publish("created", {"tasks": [event]})
+    )
     return new_task
 
 
+async def create_tasks_batch(
+    items: list[TaskBatchItem], session: AsyncSession
+) -> list[TaskBatchResult]:
+    """Создать пакет задач в одной транзакции
+
+    Авторы, исполнители и внешние родители проверяются одним IN-запросом
+    каждый. Задачи вставляются bulk INSERT ... RETURNING по уровням
+    вложенности (чтобы подзадачи получили ID родителей из пакета),
+    назначения исполнителей - одним bulk INSERT, сводки поддеревьев
+    предков обновляются сразу для всего пакета. Пакет создаётся целиком
+    или не создаётся вовсе.
+
+    Args:
+        items (list[TaskBatchItem]): Создаваемые задачи
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchResult]: ID созданных задач в порядке элементов запроса
+
+    Raises:
+        HTTPException(422): Если хотя бы один элемент не прошёл проверку,
+            detail содержит список ошибок по элементам
+    """
+    if not items:
+        return []
+
+    errors: list[TaskBatchError] = []
+    refs: dict[str, int] = {}
+    for index, item in enumerate(items):
+        if item.ref is None:
+            continue
+        if item.ref in refs:
+            errors.append(
+                TaskBatchError(index=index, ref=item.ref, error="Duplicate ref")
+            )
+        else:
+            refs[item.ref] = index
+
+    author_ids = {item.author_id for item in items}
+    assignee_ids = {
+        user_id for item in items for user_id in item.assignee_user_ids or []
+    }
+    parent_ids = {item.parent_id for item in items if item.parent_id is not None}
+
+    known_authors = set(
+        (
+            await session.execute(select(User.id).where(User.id.in_(author_ids)))
+        ).scalars()
+    )
+    known_assignees = set()
+    if assignee_ids:
+        known_assignees = set(
+            (
+                await session.execute(select(User.id).where(User.id.in_(assignee_ids)))
+            ).scalars()
+        )
+    known_parents = set()
+    if parent_ids:
+        known_parents = set(
+            (
+                await session.execute(select(Task.id).where(Task.id.in_(parent_ids)))
+            ).scalars()
+        )
+
+    levels: dict[int, int] = {}
+
+    def resolve_level(index: int) -> int | None:
+        chain: list[int] = []
+        current: int | None = index
+        while current is not None and current not in levels:
+            if current in chain:
+                return None
+            chain.append(current)
+            parent_ref = items[current].parent_ref
+            current = refs.get(parent_ref) if parent_ref is not None else None
+        level = -1 if current is None else levels[current]
+        for node in reversed(chain):
+            level += 1
+            levels[node] = level
+        return levels[index]
+
+    for index, item in enumerate(items):
+        messages = []
+        if item.author_id not in known_authors:
+            messages.append("User not found")
+        missing = sorted(set(item.assignee_user_ids or []) - known_assignees)
+        if missing:
+            messages.append(f"Assignees not found: {missing}")
+        if item.parent_id is not None and item.parent_ref is not None:
+            messages.append("parent_id and parent_ref are mutually exclusive")
+        elif item.parent_id is not None and item.parent_id not in known_parents:
+            messages.append("Parent task not found")
+        elif item.parent_ref is not None and item.parent_ref not in refs:
+            messages.append("Unknown parent_ref")
+        elif resolve_level(index) is None:
+            messages.append("parent_ref cycle")
+        errors.extend(
+            TaskBatchError(index=index, ref=item.ref, error=message)
+            for message in messages
+        )
+
+    if errors:
+        errors.sort(key=lambda error: error.index)
+        raise HTTPException(
+            status_code=422, detail=[error.model_dump() for error in errors]
+        )
+
+    task_ids: dict[int, int] = {}
+    parent_by_index: dict[int, int | None] = {}
+    created_at: dict[int, datetime] = {}
+    for level in sorted(set(levels.values())):
+        level_indexes = [index for index, value in levels.items() if value == level]
+        for index in level_indexes:
+            parent_ref = items[index].parent_ref
+            parent_by_index[index] = (
+                task_ids[refs[parent_ref]]
+                if parent_ref is not None
+                else items[index].parent_id
+            )
+        rows = [
+            {
+                "title": items[index].title,
+                "description": items[index].description,
+                "end_date": items[index].end_date,
+                "author_id": items[index].author_id,
+                "parent_id": parent_by_index[index],
+            }
+            for index in level_indexes
+        ]
+        new_rows = await session.execute(
+            insert(Task).returning(
+                Task.id, Task.created_at, sort_by_parameter_order=True
+            ),
+            rows,
+        )
+        level_rows = new_rows.all()
+        level_ids = [row.id for row in level_rows]
+        task_ids.update(zip(level_indexes, level_ids))
+        created_at.update(zip(level_indexes, (row.created_at for row in level_rows)))
+        await insert_closure_rows(session, level_ids)
+    ancestor_ids = await add_to_rollups(
+        session,
+        select(Task.id).where(Task.id.in_(list(task_ids.values()))),
+        include_internal=True,
+    )
+
+    assignee_rows = [
+        {"task_id": task_ids[index], "user_id": user_id}
+        for index, item in enumerate(items)
+        for user_id in dict.fromkeys(item.assignee_user_ids or [])
+    ]
+    if assignee_rows:
+        await session.execute(insert(TaskAssignee), assignee_rows)
+
+    events = [
+        created_task_event(
+            task_ids[index], created_at[index], parent_by_index[index], item
+        )
+        for index, item in enumerate(items)
+    ]
+    after_commit(
+        session,
+        lambda: response_cache.invalidate(
+            "tasks", *(task_tag(ancestor_id) for ancestor_id in ancestor_ids)
+        ),
+    )
+    after_commit(
+        session, lambda: change_broadcaster.publish("created", {"tasks": events})
+    )
+    return [
+        TaskBatchResult(index=index, ref=item.ref, id=task_ids[index])
+        for index, item in enumerate(items)
+    ]
+
+
 async def update_task(
     task_id: int, task_data: TaskUpdate, session: AsyncSession
 ) -> Task:
     """Частично обновить задачу
 
+    При переносе задачи или смене её статуса или срока сводки поддеревьев
+    прежних предков уменьшаются до изменения, а новых - увеличиваются
+    после него. Исполнители синхронизируются по разности множеств
+    (sync_task_assignees), пустой список снимает всех исполнителей.
+
     Args:
         task_id (int): ID обновляемой задачи
         task_data (TaskUpdate): Поля для изменения
@@ -105,32 +732,427 @@ async def update_task(
         Task: Обновлённая задача
 
     Raises:
-        HTTPException(404): Если задача не найдена
+        HTTPException(404): Если задача, новый родитель или исполнители
+            не найдены
+        HTTPException(400): Если новый родитель находится в поддереве задачи
     """
+    if "parent_id" in task_data.model_fields_set:
+        # Проверка на цикл и перенос поддерева - под одной блокировкой записи
+        await lock_for_write(session)
     task = await get_task_by_id(task_id, session)
 
     if not task:
         raise HTTPException(404, detail="Task not found")
 
-    for field, value in task_data.model_dump(exclude_unset=True).items():
+    values = task_data.model_dump(exclude_unset=True)
+    moved = "parent_id" in values and values["parent_id"] != task.parent_id
+    if moved and values["parent_id"] is not None:
+        parent = select(Task.id).where(Task.id == values["parent_id"])
+        if await session.scalar(parent) is None:
+            raise HTTPException(404, detail="Parent task not found")
+        if await is_in_subtree(session, values["parent_id"], task_id):
+            raise HTTPException(400, detail="Task cannot be moved into its own subtree")
+
+    rollup_tasks = None
+    if moved:
+        rollup_tasks = subtree_ids(select(Task.id).where(Task.id == task_id))
+    elif any(
+        field in values and values[field] != getattr(task, field)
+        for field in ("status", "end_date")
+    ):
+        rollup_tasks = select(Task.id).where(Task.id == task_id)
+
+    ancestor_ids: list[int] = []
+    if rollup_tasks is not None:
+        ancestor_ids += await remove_from_rollups(session, rollup_tasks)
+    if moved:
+        await move_subtree(session, task_id, values["parent_id"])
+
+    for field, value in values.items():
         setattr(task, field, value)
 
-    if task_data.assignee_user_ids:
+    if rollup_tasks is not None:
+        await session.flush()
+        ancestor_ids += await add_to_rollups(session, rollup_tasks)
+
+    if task_data.assignee_user_ids is not None:
+        current = set(
+            (
+                await session.execute(
+                    select(TaskAssignee.user_id).where(TaskAssignee.task_id == task_id)
+                )
+            ).scalars()
+        )
+        if await sync_task_assignees(
+            session, task_id, current, task_data.assignee_user_ids
+        ):
+            values["assignee_user_ids"] = list(
+                dict.fromkeys(task_data.assignee_user_ids)
+            )
+        else:
+            del values["assignee_user_ids"]
+    elif "assignee_user_ids" in values:
+        del values["assignee_user_ids"]
+
+    changes = {field: _event_value(value) for field, value in values.items()}
+    after_commit(
+        session,
+        lambda: response_cache.invalidate(
+            "tasks",
+            task_tag(task_id),
+            *(task_tag(ancestor_id) for ancestor_id in ancestor_ids),
+        ),
+    )
+    if changes:
+        after_commit(
+            session,
+            lambda: change_broadcaster.publish(
+                "updated", {"id": task_id, "changes": changes}
+            ),
+        )
+    return task
+
+
+async def change_task_assignees(
+    task_id: int, user_ids: list[int], session: AsyncSession, assign: bool
+) -> list[int]:
+    """Добавить или снять исполнителей задачи, не затрагивая остальных
+
+    Args:
+        task_id (int): ID задачи
+        user_ids (list[int]): ID добавляемых или снимаемых пользователей
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        assign (bool): True - добавить исполнителей, False - снять
+
+    Returns:
+        list[int]: ID всех исполнителей задачи после изменения по возрастанию
+
+    Raises:
+        HTTPException(404): Если задача или добавляемые пользователи не найдены
+    """
+    if await session.scalar(select(Task.id).where(Task.id == task_id)) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    current = set(
+        (
+            await session.execute(
+                select(TaskAssignee.user_id).where(TaskAssignee.task_id == task_id)
+            )
+        ).scalars()
+    )
+    target = current | set(user_ids) if assign else current - set(user_ids)
+    assignee_ids = sorted(target)
+    if await sync_task_assignees(session, task_id, current, assignee_ids):
+        changes = {"assignee_user_ids": assignee_ids}
+        after_commit(
+            session, lambda: response_cache.invalidate("tasks", task_tag(task_id))
+        )
+        after_commit(
+            session,
+            lambda: change_broadcaster.publish(
+                "updated", {"id": task_id, "changes": changes}
+            ),
+        )
+    return assignee_ids
+
+
+BATCH_UPDATE_FIELDS = ("title", "description", "end_date", "status")
+"""Поля, обновляемые в пакете одним UPDATE на группу задач с одинаковыми значениями."""
+
+
+async def update_tasks_batch(
+    items: list[TaskBatchUpdateItem], session: AsyncSession
+) -> list[TaskBatchOutcome]:
+    """Обновить пакет задач в одной транзакции
+
+    Текущие значения, исполнители, пользователи и новые родители
+    проверяются общими IN-запросами. Задачи с одинаковым набором новых
+    значений обновляются одним UPDATE ... WHERE id IN (...), исполнители -
+    одним DELETE и одним INSERT на весь пакет, сводки поддеревьев
+    пересчитываются один раз для всех задач со сменой статуса или срока.
+    Перенос задачи меняет таблицу замыкания её поддерева и выполняется
+    по одной задаче. Элементы, не прошедшие проверку, пропускаются,
+    остальные применяются.
+
+    Args:
+        items (list[TaskBatchUpdateItem]): ID задач и изменяемые поля
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchOutcome]: Результат по каждому элементу в порядке запроса
+    """
+    outcomes: dict[int, TaskBatchOutcome] = {}
+
+    def reject(index: int, error: str, outcome: str = "rejected") -> None:
+        outcomes[index] = TaskBatchOutcome(
+            index=index, id=items[index].id, outcome=outcome, error=error
+        )
+
+    if any("parent_id" in item.model_fields_set for item in items):
+        # Проверки переносов и перенос поддеревьев - под одной блокировкой записи
+        await lock_for_write(session)
+    ids = {item.id for item in items}
+    current = {
+        row.id: row
+        for row in await session.execute(
+            select(
+                Task.id,
+                Task.parent_id,
+                *(getattr(Task, field) for field in BATCH_UPDATE_FIELDS),
+            ).where(Task.id.in_(ids))
+        )
+    }
+
+    assignee_tasks = {item.id for item in items if item.assignee_user_ids is not None}
+    assignees: dict[int, set[int]] = {task_id: set() for task_id in assignee_tasks}
+    if assignee_tasks:
+        for row in await session.execute(
+            select(TaskAssignee.task_id, TaskAssignee.user_id).where(
+                TaskAssignee.task_id.in_(assignee_tasks)
+            )
+        ):
+            assignees[row.task_id].add(row.user_id)
+    missing_users = set(
+        await missing_user_ids(
+            session,
+            {user_id for item in items for user_id in item.assignee_user_ids or []},
+        )
+    )
+
+    parent_ids = {
+        item.parent_id
+        for item in items
+        if "parent_id" in item.model_fields_set and item.parent_id is not None
+    }
+    known_parents = set()
+    if parent_ids:
+        known_parents = set(
+            (
+                await session.execute(select(Task.id).where(Task.id.in_(parent_ids)))
+            ).scalars()
+        )
+
+    changes: dict[int, dict[str, Any]] = {}
+    seen: set[int] = set()
+    for index, item in enumerate(items):
+        if item.id in seen:
+            reject(index, "Duplicate id")
+            continue
+        seen.add(item.id)
+        task_row = current.get(item.id)
+        if task_row is None:
+            reject(index, "Task not found", "not_found")
+            continue
+
+        values = item.model_dump(
+            exclude_unset=True, exclude={"id", "assignee_user_ids"}
+        )
+        nulls = [
+            field
+            for field in BATCH_UPDATE_FIELDS
+            if field in values and values[field] is None
+        ]
+        missing = sorted(set(item.assignee_user_ids or []) & missing_users)
+        changed = {
+            field: value
+            for field, value in values.items()
+            if value != getattr(task_row, field)
+        }
+        if nulls:
+            reject(index, f"Fields cannot be null: {nulls}")
+        elif missing:
+            reject(index, f"Assignees not found: {missing}", "not_found")
+        elif changed.get("parent_id", None) not in (None, *known_parents):
+            reject(index, "Parent task not found", "not_found")
+        else:
+            if item.assignee_user_ids is not None:
+                assignee_ids = list(dict.fromkeys(item.assignee_user_ids))
+                if set(assignee_ids) != assignees[item.id]:
+                    changed["assignee_user_ids"] = assignee_ids
+            changes[index] = changed
+
+    ancestor_ids: list[int] = []
+    for index, changed in list(changes.items()):
+        if "parent_id" not in changed:
+            continue
+        task_id, parent_id = items[index].id, changed["parent_id"]
+        if parent_id is not None and await is_in_subtree(session, parent_id, task_id):
+            reject(index, "Task cannot be moved into its own subtree")
+            del changes[index]
+            continue
+        subtree = subtree_ids(select(Task.id).where(Task.id == task_id))
+        ancestor_ids += await remove_from_rollups(session, subtree)
+        await move_subtree(session, task_id, parent_id)
         await session.execute(
-            delete(TaskAssignee).where(TaskAssignee.task_id == task_id)
+            update(Task)
+            .where(Task.id == task_id)
+            .values(parent_id=parent_id)
+            .execution_options(synchronize_session=False)
+        )
+        ancestor_ids += await add_to_rollups(session, subtree)
+
+    # Задачи пакета могут быть предками друг друга, поэтому сводки
+    # пересчитываются и для предков внутри набора
+    rollup_ids = [
+        items[index].id
+        for index, changed in changes.items()
+        if "status" in changed or "end_date" in changed
+    ]
+    rollup_tasks = select(Task.id).where(Task.id.in_(rollup_ids))
+    if rollup_ids:
+        ancestor_ids += await remove_from_rollups(
+            session, rollup_tasks, include_internal=True
         )
-        new_assignees = [
-            TaskAssignee(task_id=task_id, user_id=user_id)
-            for user_id in task_data.assignee_user_ids  # type: ignore
+
+    groups: dict[tuple[tuple[str, Any], ...], list[int]] = {}
+    for index, changed in changes.items():
+        key = tuple(
+            (field, changed[field]) for field in BATCH_UPDATE_FIELDS if field in changed
+        )
+        if key:
+            groups.setdefault(key, []).append(items[index].id)
+    for key, task_ids in groups.items():
+        await session.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids))
+            .values(dict(key))
+            .execution_options(synchronize_session=False)
+        )
+
+    if rollup_ids:
+        ancestor_ids += await add_to_rollups(
+            session, rollup_tasks, include_internal=True
+        )
+
+    removed_assignees = []
+    added_assignees = []
+    for index, changed in changes.items():
+        if "assignee_user_ids" not in changed:
+            continue
+        task_id = items[index].id
+        target = changed["assignee_user_ids"]
+        removed_assignees += [
+            (task_id, user_id)
+            for user_id in assignees[task_id]
+            if user_id not in target
+        ]
+        added_assignees += [
+            {"task_id": task_id, "user_id": user_id}
+            for user_id in target
+            if user_id not in assignees[task_id]
         ]
-        session.add_all(new_assignees)
+    if removed_assignees:
+        await session.execute(
+            delete(TaskAssignee)
+            .where(
+                tuple_(TaskAssignee.task_id, TaskAssignee.user_id).in_(
+                    removed_assignees
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+    if added_assignees:
+        await session.execute(
+            sqlite_insert(TaskAssignee).on_conflict_do_nothing(), added_assignees
+        )
 
-    await session.commit()
-    return task
+    events: list[TaskRow] = [
+        {
+            "id": items[index].id,
+            "changes": {field: _event_value(value) for field, value in changed.items()},
+        }
+        for index, changed in changes.items()
+        if changed
+    ]
+    for index, changed in changes.items():
+        outcomes[index] = TaskBatchOutcome(
+            index=index,
+            id=items[index].id,
+            outcome="updated" if changed else "unchanged",
+        )
+
+    if events:
+        changed_tags = [task_tag(event["id"]) for event in events]
+        after_commit(
+            session,
+            lambda: response_cache.invalidate(
+                "tasks",
+                *changed_tags,
+                *(task_tag(ancestor_id) for ancestor_id in ancestor_ids),
+            ),
+        )
+        after_commit(session, lambda: publish_updated(events))
+    return [outcomes[index] for index in range(len(items))]
+
+
+def publish_updated(events: list[TaskRow]) -> None:
+    """Опубликовать события updated по каждой изменённой задаче пакета."""
+    for event in events:
+        change_broadcaster.publish("updated", event)
+
+
+async def delete_subtrees(session: AsyncSession, task_ids: Iterable[int]) -> list[int]:
+    """Удалить задачи вместе со всеми их подзадачами
+
+    Поддеревья выбираются по таблице замыкания и удаляются set-based
+    DELETE (назначения, сводки, задачи, затем строки замыкания) без
+    загрузки объектов в сессию. Сводки поддеревьев предков уменьшаются
+    до удаления. После коммита сбрасывается кэш и публикуется событие
+    deleted.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_ids (Iterable[int]): ID корней удаляемых поддеревьев
+
+    Returns:
+        list[int]: ID всех удалённых задач (пустой, если задачи не найдены)
+    """
+    deleted = (
+        select(TaskClosure.descendant_id)
+        .where(TaskClosure.ancestor_id.in_(set(task_ids)))
+        .distinct()
+    )
+    deleted_ids = (await session.execute(deleted)).scalars().all()
+    if not deleted_ids:
+        return []
+    ancestor_ids = await remove_from_rollups(session, deleted)
+
+    after_commit(
+        session,
+        lambda: response_cache.invalidate(
+            "tasks",
+            *(task_tag(changed_id) for changed_id in [*deleted_ids, *ancestor_ids]),
+        ),
+    )
+    after_commit(
+        session, lambda: change_broadcaster.publish("deleted", {"ids": deleted_ids})
+    )
+
+    await session.execute(
+        delete(TaskAssignee)
+        .where(TaskAssignee.task_id.in_(deleted))
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(TaskStatusRollup)
+        .where(TaskStatusRollup.task_id.in_(deleted))
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(Task)
+        .where(Task.id.in_(deleted))
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        delete(TaskClosure)
+        .where(TaskClosure.descendant_id.in_(deleted))
+        .execution_options(synchronize_session=False)
+    )
+    return list(deleted_ids)
 
 
 async def delete_task(task_id: int, session: AsyncSession) -> None:
-    """Удалить задачу и все её подзадачи
+    """Удалить задачу и все её подзадачи (см. delete_subtrees)
 
     Args:
         task_id (int): ID удаляемой задачи
@@ -139,9 +1161,33 @@ async def delete_task(task_id: int, session: AsyncSession) -> None:
     Raises:
         HTTPException(404): Если задача не найдена
     """
-    task = await session.get(Task, task_id)
-    if not task:
+    if not await delete_subtrees(session, [task_id]):
         raise HTTPException(status_code=404, detail="Task not found")
 
-    await session.delete(task)
-    await session.commit()
+
+async def delete_tasks_batch(
+    task_ids: list[int], session: AsyncSession
+) -> list[TaskBatchOutcome]:
+    """Удалить пакет задач с подзадачами в одной транзакции
+
+    Все поддеревья удаляются общими DELETE (см. delete_subtrees).
+    Задача из поддерева другой задачи пакета тоже считается удалённой.
+
+    Args:
+        task_ids (list[int]): ID удаляемых задач
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchOutcome]: Результат по каждому ID в порядке запроса
+    """
+    deleted = set(await delete_subtrees(session, task_ids))
+    return [
+        (
+            TaskBatchOutcome(index=index, id=task_id, outcome="deleted")
+            if task_id in deleted
+            else TaskBatchOutcome(
+                index=index, id=task_id, outcome="not_found", error="Task not found"
+            )
+        )
+        for index, task_id in enumerate(task_ids)
+    ]
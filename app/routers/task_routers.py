@@ -1,27 +1,95 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.database import get_db
+from app.cache.response_cache import cached_json_response, render_rows, task_tag
+from app.database.change_log import change_log_cursor
+from app.database.database import get_db, get_read_db
+from app.database.write_queue import execute_write
 from app.models.tasks import Task
 from app.routers.task_management import (
+    change_task_assignees,
     create_task,
+    create_tasks_batch,
     delete_task,
+    delete_tasks_batch,
     get_all_tasks,
-    get_task_by_id,
+    get_task_changes,
+    get_task_detail,
+    get_task_subtree,
+    get_tasks_page,
+    stream_task_tree,
+    task_projection,
     update_task,
+    update_tasks_batch,
+)
+from app.routers.task_search import search_tasks
+from app.shemas.task_get_schemas import (
+    TaskChangesResponse,
+    TaskFieldsParams,
+    TaskListParams,
+    TaskResponse,
+    TaskResponseById,
+    TaskSearchParams,
+    TaskSearchResult,
+)
+from app.shemas.task_patch_schemas import (
+    TaskBatchOutcome,
+    TaskBatchUpdateItem,
+    TaskUpdate,
+)
+from app.shemas.task_post_schemas import (
+    TaskAssigneesChange,
+    TaskAssigneesResponse,
+    TaskBatchItem,
+    TaskBatchResult,
+    TaskCreate,
 )
-from app.shemas.task_get_schemas import TaskResponse, TaskResponseById
-from app.shemas.task_patch_schemas import TaskUpdate
-from app.shemas.task_post_schemas import TaskCreate
 
 router = APIRouter(prefix="/api")
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.get("/tasks", response_model=list[TaskResponse])
-async def read_tasks(db: AsyncSession = Depends(get_db)) -> list[Task]:
+async def read_tasks(
+    request: Request,
+    params: TaskListParams = Depends(),
+    projection: TaskFieldsParams = Depends(),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Получить список корневых задач с подзадачами
 
+    Без параметров возвращает весь лес задач и курсор журнала изменений
+    в заголовке X-Change-Cursor (для /api/tasks/changes). С фильтрами
+    или limit возвращает страницу задач, курсор следующей страницы
+    передаётся в заголовке X-Next-Cursor.
+
+    fields оставляет в задачах только перечисленные поля, depth
+    ограничивает глубину подзадач и добавляет children_count для
+    ленивого раскрытия узлов. Из БД выбирается только запрошенное.
+
+    При stream=1 или заголовке Accept: application/x-ndjson дерево отдаётся
+    потоково: по одной корневой задаче с поддеревом на строку NDJSON.
+
+    Обычные ответы кэшируются и содержат ETag, при совпадении
+    If-None-Match возвращается 304.
+
     Args:
+        request (Request): Входящий запрос
+        params (TaskListParams): Фильтры и параметры пагинации
+        projection (TaskFieldsParams): Выборочные поля и глубина подзадач
+        stream (bool): Включить потоковый режим NDJSON
         db (AsyncSession): Асинхронная сессия SQLAlchemy
 
     Returns:
@@ -29,8 +97,96 @@ async def read_tasks(db: AsyncSession = Depends(get_db)) -> list[Task]:
 
     Status Codes:
         200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
+        400 Bad Request: Неизвестные поля в fields
+    """
+    fields, depth = task_projection(projection)
+    if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_task_tree(params, fields, depth), media_type=NDJSON_MEDIA_TYPE
+        )
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        if params.is_empty():
+            # Курсор читается до дерева: изменения между чтениями придут повторно
+            cursor = await change_log_cursor(db)
+            tasks = await get_all_tasks(db, fields, depth)
+            return render_rows(tasks), {"X-Change-Cursor": str(cursor)}
+
+        tasks, next_cursor = await get_tasks_page(params, db, fields, depth)
+        headers = {} if next_cursor is None else {"X-Next-Cursor": str(next_cursor)}
+        return render_rows(tasks), headers
+
+    return await cached_json_response(request, ("tasks", "users"), render)
+
+
+@router.get("/tasks/changes", response_model=TaskChangesResponse)
+async def get_task_changes_endpoint(
+    request: Request,
+    since: int = Query(ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Получить изменения задач после курсора (дельта-синхронизация)
+
+    Клиент загружает дерево через GET /api/tasks, запоминает заголовок
+    X-Change-Cursor и после переподключения запрашивает только изменения
+    с этого курсора, повторяя запрос, пока has_more истинно.
+
+    Args:
+        request (Request): Входящий запрос
+        since (int): Курсор из X-Change-Cursor или предыдущего ответа
+        limit (int): Максимум изменений в ответе
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        TaskChangesResponse: Изменённые и удалённые задачи и новый курсор
+
+    Status Codes:
+        200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
+        410 Gone: Курсор старше уплотнённого журнала, дерево нужно
+            загрузить заново
+    """
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        return render_rows(await get_task_changes(since, limit, db)), {}
+
+    return await cached_json_response(request, ("tasks", "users"), render)
+
+
+@router.get("/tasks/search", response_model=list[TaskSearchResult])
+async def search_tasks_endpoint(
+    request: Request,
+    params: TaskSearchParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Полнотекстовый поиск задач по заголовку и описанию
+
+    Результаты упорядочены по релевантности bm25 (совпадения в заголовке
+    весят больше), курсор следующей страницы передаётся в заголовке
+    X-Next-Cursor.
+
+    Args:
+        request (Request): Входящий запрос
+        params (TaskSearchParams): Поисковая строка, фильтры и пагинация
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskSearchResult]: Найденные задачи с фрагментами текста
+
+    Status Codes:
+        200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
+        400 Bad Request: Некорректный курсор
     """
-    return await get_all_tasks(db)
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        results, next_cursor = await search_tasks(params, db)
+        headers = {} if next_cursor is None else {"X-Next-Cursor": next_cursor}
+        return render_rows(results), headers
+
+    return await cached_json_response(request, ("tasks",), render)
 
 
 @router.post("/tasks", response_model=TaskCreate, status_code=status.HTTP_201_CREATED)
@@ -48,9 +204,81 @@ async def create_new_task(
 
     Status Codes:
         201 Created: Успешное создание
-        404 Not Found: Автор не найден
+        404 Not Found: Автор, исполнители или родительская задача не найдены
+    """
+    return await execute_write(db, lambda session: create_task(task_data, session))
+
+
+@router.post(
+    "/tasks:batch",
+    response_model=list[TaskBatchResult],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tasks_batch_endpoint(
+    items: list[TaskBatchItem], db: AsyncSession = Depends(get_db)
+) -> list[TaskBatchResult]:
+    """Создать пакет задач
+
+    Подзадачи могут ссылаться на родителя из того же пакета через
+    ref/parent_ref. Пакет создаётся в одной транзакции целиком.
+
+    Args:
+        items (list[TaskBatchItem]): Создаваемые задачи
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchResult]: ID созданных задач по элементам запроса
+
+    Status Codes:
+        201 Created: Все задачи созданы
+        422 Unprocessable Entity: Ошибки валидации по элементам, ничего не создано
     """
-    return await create_task(task_data, db)
+    return await execute_write(db, lambda session: create_tasks_batch(items, session))
+
+
+@router.patch("/tasks:batch", response_model=list[TaskBatchOutcome])
+async def update_tasks_batch_endpoint(
+    items: list[TaskBatchUpdateItem], db: AsyncSession = Depends(get_db)
+) -> list[TaskBatchOutcome]:
+    """Обновить пакет задач
+
+    Все элементы применяются в одной транзакции set-based запросами.
+    Элементы с ошибками (задача, родитель или исполнители не найдены,
+    перенос в собственное поддерево) пропускаются, их причина
+    возвращается в результате.
+
+    Args:
+        items (list[TaskBatchUpdateItem]): ID задач и изменяемые поля
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchOutcome]: Результат по каждому элементу запроса
+
+    Status Codes:
+        200 OK: Пакет обработан, результаты - по элементам
+    """
+    return await execute_write(db, lambda session: update_tasks_batch(items, session))
+
+
+@router.delete("/tasks:batch", response_model=list[TaskBatchOutcome])
+async def delete_tasks_batch_endpoint(
+    task_ids: list[int] = Body(), db: AsyncSession = Depends(get_db)
+) -> list[TaskBatchOutcome]:
+    """Удалить пакет задач со всеми вложенными подзадачами
+
+    Args:
+        task_ids (list[int]): ID удаляемых задач
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        list[TaskBatchOutcome]: Результат по каждому ID запроса
+
+    Status Codes:
+        200 OK: Пакет обработан, результаты - по элементам
+    """
+    return await execute_write(
+        db, lambda session: delete_tasks_batch(task_ids, session)
+    )
 
 
 @router.patch("/tasks/{id}", response_model=TaskUpdate)
@@ -71,7 +299,7 @@ async def update_existing_task(
         200 OK: Успешное обновление
         404 Not Found: Задача не найдена
     """
-    return await update_task(id, task_data, db)
+    return await execute_write(db, lambda session: update_task(id, task_data, session))
 
 
 @router.delete("/tasks/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -86,15 +314,72 @@ async def delete_task_endpoint(id: int, db: AsyncSession = Depends(get_db)) -> N
         204 No Content: Успешное удаление
         404 Not Found: Задача не найдена
     """
-    await delete_task(id, db)
+    await execute_write(db, lambda session: delete_task(id, session))
+
+
+@router.post("/tasks/{id}/assignees", response_model=TaskAssigneesResponse)
+async def add_task_assignees_endpoint(
+    id: int, change: TaskAssigneesChange, db: AsyncSession = Depends(get_db)
+) -> TaskAssigneesResponse:
+    """Добавить исполнителей задачи, сохранив текущих
+
+    Args:
+        id (int): ID задачи
+        change (TaskAssigneesChange): ID добавляемых пользователей
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        TaskAssigneesResponse: Все исполнители задачи после изменения
+
+    Status Codes:
+        200 OK: Успешное изменение
+        404 Not Found: Задача или пользователи не найдены
+    """
+    assignee_ids = await execute_write(
+        db, lambda session: change_task_assignees(id, change.user_ids, session, True)
+    )
+    return TaskAssigneesResponse(id=id, assignee_user_ids=assignee_ids)
+
+
+@router.delete("/tasks/{id}/assignees", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_task_assignees_endpoint(
+    id: int,
+    user_ids: list[int] = Query(min_length=1),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Снять исполнителей задачи, не затрагивая остальных
+
+    Args:
+        id (int): ID задачи
+        user_ids (list[int]): ID снимаемых пользователей
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Status Codes:
+        204 No Content: Успешное изменение
+        404 Not Found: Задача не найдена
+    """
+    await execute_write(
+        db, lambda session: change_task_assignees(id, user_ids, session, False)
+    )
 
 
 @router.get("/tasks/{id}", response_model=TaskResponseById)
-async def get_task_id(id: int, db: AsyncSession = Depends(get_db)) -> Task | None:
+async def get_task_id(
+    id: int,
+    request: Request,
+    projection: TaskFieldsParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Получить задачу с подробной информацией
 
+    С fields или depth задача возвращается в форме TaskResponse
+    с запрошенными полями и подзадачами до глубины depth (по умолчанию
+    без подзадач).
+
     Args:
         id (int): ID запрашиваемой задачи
+        request (Request): Входящий запрос
+        projection (TaskFieldsParams): Выборочные поля и глубина подзадач
         db (AsyncSession): Асинхронная сессия SQLAlchemy
 
     Returns:
@@ -102,6 +387,60 @@ async def get_task_id(id: int, db: AsyncSession = Depends(get_db)) -> Task | Non
 
     Status Codes:
         200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
+        400 Bad Request: Неизвестные поля в fields
         404 Not Found: Задача не найдена
     """
-    return await get_task_by_id(id, db)
+    if not projection.is_empty():
+        fields, depth = task_projection(projection)
+
+        async def render_projection() -> tuple[bytes, dict[str, str]]:
+            task = await get_task_subtree(id, depth or 0, db, fields)
+            if not task:
+                raise HTTPException(status_code=404, detail="Task not found")
+            return render_rows(task), {}
+
+        return await cached_json_response(
+            request, ("tasks", "users"), render_projection
+        )
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        task = await get_task_detail(id, db)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return render_rows(task), {}
+
+    return await cached_json_response(request, (task_tag(id), "users"), render)
+
+
+@router.get("/tasks/{id}/subtree", response_model=TaskResponse)
+async def get_task_subtree_endpoint(
+    id: int,
+    request: Request,
+    max_depth: int | None = Query(None, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    """Получить ветку дерева задач
+
+    Args:
+        id (int): ID корня ветки
+        request (Request): Входящий запрос
+        max_depth (int | None): Глубина вложенности (0 - только сама задача)
+        db (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        TaskResponse: Задача с подзадачами до указанной глубины
+
+    Status Codes:
+        200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
+        404 Not Found: Задача не найдена
+    """
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        task = await get_task_subtree(id, max_depth, db)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return render_rows(task), {}
+
+    return await cached_json_response(request, ("tasks", "users"), render)
@@ -0,0 +1,152 @@
+import base64
+import html
+import json
+import re
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import Float, Integer, column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.sql.expression import ColumnClause
+
+from app.models.tasks import Task, TaskAssignee
+from app.routers.task_tree import TaskRow, formatted_date
+from app.shemas.task_get_schemas import TaskSearchParams
+
+SNIPPET_TOKENS = 12
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+tasks_fts = table("tasks_fts", column("rowid", Integer), column("rank", Float))
+"""Индекс FTS5 по title/description задач.
+
+Создаётся миграцией и синхронизируется с tasks триггерами.
+"""
+
+
+def fts_query(text: str) -> str | None:
+    """Преобразовать поисковую строку в безопасный запрос FTS5
+
+    Слова берутся в кавычки, поэтому операторы FTS5 во вводе
+    пользователя не интерпретируются; последнее слово ищется по префиксу.
+
+    Args:
+        text (str): Поисковая строка пользователя
+
+    Returns:
+        str | None: Запрос для MATCH или None, если в строке нет слов
+    """
+    terms = [f'"{term}"' for term in re.findall(r"\w+", text)]
+    if not terms:
+        return None
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def encode_cursor(rank: float, task_id: int) -> str:
+    """Закодировать позицию (rank, id) последнего результата страницы."""
+    return base64.urlsafe_b64encode(json.dumps([rank, task_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    """Раскодировать курсор поиска
+
+    Raises:
+        HTTPException(400): Если курсор повреждён
+    """
+    try:
+        rank, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def highlight(snippet: str) -> str:
+    """Экранировать фрагмент для HTML и выделить найденные слова тегом <mark>."""
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_END, "</mark>")
+    )
+
+
+async def search_tasks(
+    params: TaskSearchParams, session: AsyncSession
+) -> tuple[list[TaskRow], str | None]:
+    """Найти задачи по заголовку и описанию с ранжированием bm25
+
+    Поиск идёт по индексу FTS5, результаты упорядочены по (rank, id),
+    страницы продолжаются keyset-условием по этой паре, поэтому
+    глубокие страницы не требуют OFFSET.
+
+    Args:
+        params (TaskSearchParams): Поисковая строка, фильтры и пагинация
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        tuple[list[TaskRow], str | None]: Результаты в форме TaskSearchResult
+            и курсор следующей страницы (None, если страница последняя)
+
+    Raises:
+        HTTPException(400): Если курсор повреждён
+    """
+    query = fts_query(params.q)
+    if query is None:
+        return [], None
+
+    fts: ColumnClause[Any] = literal_column("tasks_fts")
+    stmt = (
+        select(
+            Task.id,
+            Task.title,
+            Task.status,
+            Task.parent_id,
+            formatted_date(Task.end_date).label("end_date"),
+            func.snippet(
+                fts, -1, SNIPPET_START, SNIPPET_END, "…", SNIPPET_TOKENS
+            ).label("snippet"),
+            tasks_fts.c.rank,
+        )
+        .select_from(tasks_fts)
+        .join(Task, Task.id == tasks_fts.c.rowid)
+        .where(fts.match(query))
+        .order_by(tasks_fts.c.rank, Task.id)
+        .limit(params.limit + 1)
+    )
+    if params.status is not None:
+        stmt = stmt.where(Task.status == params.status)
+    if params.assignee_id is not None:
+        stmt = stmt.where(
+            Task.id.in_(
+                select(TaskAssignee.task_id).where(
+                    TaskAssignee.user_id == params.assignee_id
+                )
+            )
+        )
+    if params.cursor is not None:
+        rank, task_id = decode_cursor(params.cursor)
+        stmt = stmt.where(
+            or_(
+                tasks_fts.c.rank > rank,
+                (tasks_fts.c.rank == rank) & (Task.id > task_id),
+            )
+        )
+
+    rows = (await session.execute(stmt)).all()
+    results = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "status": row.status,
+            "parent_id": row.parent_id,
+            "end_date": row.end_date,
+            "snippet": highlight(row.snippet),
+            "rank": row.rank,
+        }
+        for row in rows[: params.limit]
+    ]
+    next_cursor = None
+    if len(rows) > params.limit:
+        last = rows[params.limit - 1]
+        next_cursor = encode_cursor(last.rank, last.id)
+    return results, next_cursor
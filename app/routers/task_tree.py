@@ -0,0 +1,533 @@
+from typing import Any, Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Subquery,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.cache.user_cache import user_cache
+from app.models.stats import CLOSED_STATUS
+from app.models.tasks import Task, TaskAssignee, TaskClosure, TaskStatusRollup
+
+CLOSURE_CHUNK_SIZE = 5000
+CLOSURE_COLUMNS = ["ancestor_id", "descendant_id", "depth"]
+
+
+TASK_DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+TaskRow = dict[str, Any]
+
+
+def formatted_date(column: Any) -> ColumnElement[str | None]:
+    """Отформатировать дату в SQL так же, как json_encoders схем ответа
+
+    Args:
+        column (Any): Колонка с датой
+
+    Returns:
+        ColumnElement[str | None]: Строка "YYYY-MM-DD HH:MM" или NULL
+    """
+    return func.strftime(TASK_DATE_FORMAT, column)
+
+
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "parent_id",
+    "children",
+    "children_count",
+    "created_at",
+    "end_date",
+    "author",
+    "status",
+    "assignees",
+    "descendant_count",
+    "descendant_statuses",
+    "earliest_open_end_date",
+)
+"""Поля задачи в порядке ключей ответа."""
+
+REQUIRED_TASK_FIELDS = frozenset({"id", "parent_id"})
+"""Поля, которые возвращаются всегда: по ним строится дерево."""
+
+DEFAULT_TASK_FIELDS = frozenset(TASK_FIELDS) - {"children_count"}
+"""Поля TaskResponse; children_count возвращается только по запросу."""
+
+
+def task_column(field: str) -> ColumnElement[Any]:
+    """Получить выражение SELECT для поля задачи
+
+    Поля, собираемые в Python (children, assignees, descendant_statuses),
+    выбираются как NULL, чтобы строка результата сразу давала словарь
+    с нужным порядком ключей; author выбирается как ID автора.
+
+    Args:
+        field (str): Имя поля из TASK_FIELDS
+
+    Returns:
+        ColumnElement[Any]: Выражение с меткой, равной имени поля
+    """
+    if field == "children_count":
+        child = aliased(Task)
+        return (
+            select(func.count())
+            .where(child.parent_id == Task.id)
+            .scalar_subquery()
+            .label(field)
+        )
+    if field in ("children", "assignees", "descendant_statuses"):
+        return null().label(field)
+    if field in ("created_at", "end_date", "earliest_open_end_date"):
+        return formatted_date(getattr(Task, field)).label(field)
+    if field == "author":
+        return Task.author_id.label(field)
+    return getattr(Task, field).label(field)
+
+
+async def load_task_rows(
+    session: AsyncSession,
+    task_ids: Select | None = None,
+    nested: bool = True,
+    fields: frozenset[str] = DEFAULT_TASK_FIELDS,
+) -> dict[int, TaskRow]:
+    """Загрузить задачи, авторов и исполнителей плоскими запросами в словари
+
+    Выполняет не больше трёх SELECT (задачи, назначения, сводки поддеревьев
+    по статусам) независимо от глубины дерева; авторы и исполнители берутся
+    из кэша пользователей (user_cache), из БД одним запросом догружаются
+    только отсутствующие в нём. Собирает
+    словари в форме TaskResponse (с тем же порядком ключей) без создания
+    ORM-объектов и валидации схемой. Даты форматируются в SQL, поэтому
+    результат сериализуется напрямую через render_rows и совпадает
+    с ответом схемы байт в байт.
+
+    При выборочных полях в SELECT попадают только нужные колонки,
+    а пользователи, назначения и сводки не загружаются, если
+    author, assignees и descendant_statuses не запрошены.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_ids (Select | None): Подзапрос с ID нужных задач (None - все задачи)
+        nested (bool): Раскладывать задачи по children родителей; при False
+            children остаются пустыми (плоский список, структура - по parent_id)
+        fields (frozenset[str]): Поля задач из TASK_FIELDS (id и parent_id
+            должны входить в набор)
+
+    Returns:
+        dict[int, TaskRow]: Индекс id -> задача с запрошенными полями
+    """
+    task_stmt = select(
+        *(task_column(field) for field in TASK_FIELDS if field in fields)
+    ).order_by(Task.id)
+    assignee_stmt = select(
+        TaskAssignee.task_id, TaskAssignee.user_id, TaskAssignee.assignee_status
+    )
+    rollup_stmt = select(
+        TaskStatusRollup.task_id, TaskStatusRollup.status, TaskStatusRollup.count
+    ).order_by(TaskStatusRollup.task_id, TaskStatusRollup.status)
+
+    if task_ids is not None:
+        task_stmt = task_stmt.where(Task.id.in_(task_ids))
+        assignee_stmt = assignee_stmt.where(TaskAssignee.task_id.in_(task_ids))
+        rollup_stmt = rollup_stmt.where(TaskStatusRollup.task_id.in_(task_ids))
+
+    index: dict[int, TaskRow] = {
+        row.id: row._asdict() for row in await session.execute(task_stmt)
+    }
+
+    assignees = []
+    if "assignees" in fields:
+        assignees = list(await session.execute(assignee_stmt))
+
+    user_ids = {assignee.user_id for assignee in assignees}
+    if "author" in fields:
+        user_ids.update(task["author"] for task in index.values())
+    users = await user_cache.get_many(session, user_ids)
+
+    if "author" in fields:
+        for task in index.values():
+            task["author"] = users[task["author"]]
+
+    if "assignees" in fields:
+        for task in index.values():
+            task["assignees"] = []
+        for assignee in assignees:
+            index[assignee.task_id]["assignees"].append(
+                {
+                    "user": users[assignee.user_id],
+                    "assignee_status": assignee.assignee_status,
+                }
+            )
+
+    if "descendant_statuses" in fields:
+        for task in index.values():
+            task["descendant_statuses"] = {}
+        for rollup in await session.execute(rollup_stmt):
+            index[rollup.task_id]["descendant_statuses"][rollup.status] = rollup.count
+
+    if "children" in fields:
+        for task in index.values():
+            task["children"] = []
+        if nested:
+            for task in index.values():
+                parent = index.get(task["parent_id"])
+                if parent is not None:
+                    parent["children"].append(task)
+
+    return index
+
+
+def subtree_ids(anchor: Select, max_depth: int | None = None) -> Select:
+    """Построить запрос ID задач вместе со всеми их потомками
+
+    Использует таблицу замыкания, поэтому поддерево любой глубины
+    выбирается одним индексированным запросом.
+
+    Args:
+        anchor (Select): Запрос вида select(Task.id) с корнями поддеревьев
+        max_depth (int | None): Максимальная глубина относительно корней
+            (0 - только корни, None - без ограничения)
+
+    Returns:
+        Select: Запрос ID корней и их потомков
+    """
+    stmt = select(TaskClosure.descendant_id).where(TaskClosure.ancestor_id.in_(anchor))
+    if max_depth is not None:
+        stmt = stmt.where(TaskClosure.depth <= max_depth)
+    return stmt
+
+
+async def is_in_subtree(session: AsyncSession, task_id: int, root_id: int) -> bool:
+    """Проверить, находится ли задача в поддереве другой задачи (включая её саму)
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_id (int): ID проверяемой задачи
+        root_id (int): ID корня поддерева
+
+    Returns:
+        bool: True, если root_id является предком task_id или совпадает с ним
+    """
+    depth = await session.scalar(
+        select(TaskClosure.depth).where(
+            TaskClosure.ancestor_id == root_id, TaskClosure.descendant_id == task_id
+        )
+    )
+    return depth is not None
+
+
+async def insert_closure_rows(session: AsyncSession, task_ids: Sequence[int]) -> None:
+    """Добавить строки замыкания для новых задач
+
+    Родители задач должны уже иметь строки замыкания, поэтому при
+    вставке нескольких уровней функция вызывается по уровням сверху вниз.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_ids (Sequence[int]): ID только что вставленных задач
+    """
+    for start in range(0, len(task_ids), CLOSURE_CHUNK_SIZE):
+        end = start + CLOSURE_CHUNK_SIZE
+        chunk = task_ids[start:end]
+        await session.execute(
+            insert(TaskClosure).from_select(
+                CLOSURE_COLUMNS,
+                select(Task.id, Task.id, literal(0)).where(Task.id.in_(chunk)),
+            )
+        )
+        await session.execute(
+            insert(TaskClosure).from_select(
+                CLOSURE_COLUMNS,
+                select(TaskClosure.ancestor_id, Task.id, TaskClosure.depth + 1)
+                .join(TaskClosure, TaskClosure.descendant_id == Task.parent_id)
+                .where(Task.id.in_(chunk)),
+            )
+        )
+
+
+async def move_subtree(
+    session: AsyncSession, task_id: int, new_parent_id: int | None
+) -> None:
+    """Перенести поддерево задачи под нового родителя в таблице замыкания
+
+    Удаляет пути от прежних предков к узлам поддерева и добавляет пути
+    от предков нового родителя. Проверка на цикл выполняется вызывающей
+    стороной через is_in_subtree.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_id (int): ID переносимой задачи
+        new_parent_id (int | None): ID нового родителя (None - сделать корневой)
+    """
+    subtree = select(TaskClosure.descendant_id).where(
+        TaskClosure.ancestor_id == task_id
+    )
+    await session.execute(
+        delete(TaskClosure)
+        .where(
+            TaskClosure.descendant_id.in_(subtree),
+            TaskClosure.ancestor_id.not_in(subtree),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if new_parent_id is None:
+        return
+
+    above = aliased(TaskClosure)
+    below = aliased(TaskClosure)
+    await session.execute(
+        insert(TaskClosure).from_select(
+            CLOSURE_COLUMNS,
+            select(
+                above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+            )
+            .join(below, below.ancestor_id == task_id)
+            .where(above.descendant_id == new_parent_id),
+        )
+    )
+
+
+async def rebuild_task_closure(session: AsyncSession) -> None:
+    """Полностью перестроить таблицу замыкания по parent_id
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+    """
+    await session.execute(delete(TaskClosure))
+    await session.execute(
+        text(
+            """
+            WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+                SELECT id, id, 0 FROM tasks
+                UNION ALL
+                SELECT closure.ancestor_id, tasks.id, closure.depth + 1
+                FROM closure JOIN tasks ON tasks.parent_id = closure.descendant_id
+            )
+            INSERT INTO task_closure (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, descendant_id, depth FROM closure
+            """
+        )
+    )
+
+
+def _rollup_contributions(task_ids: Select, include_internal: bool) -> Select:
+    """Построить запрос вклада задач в сводки их предков
+
+    Args:
+        task_ids (Select): Запрос ID задач, чей вклад считается
+        include_internal (bool): Учитывать и предков из того же набора
+
+    Returns:
+        Select: Строки (ancestor_id, status, count, earliest) по предку и статусу
+    """
+    closure = aliased(TaskClosure)
+    stmt = (
+        select(
+            closure.ancestor_id,
+            Task.status,
+            func.count().label("count"),
+            func.min(case((Task.status != CLOSED_STATUS, Task.end_date))).label(
+                "earliest"
+            ),
+        )
+        .join(Task, Task.id == closure.descendant_id)
+        .where(closure.descendant_id.in_(task_ids), closure.depth > 0)
+        .group_by(closure.ancestor_id, Task.status)
+    )
+    if not include_internal:
+        stmt = stmt.where(closure.ancestor_id.not_in(task_ids))
+    return stmt
+
+
+async def _bump_status_rollups(session: AsyncSession, counts: Select) -> None:
+    """Прибавить строки (task_id, status, count) к счётчикам по статусам."""
+    # WHERE обязателен: без него SQLite разбирает ON CONFLICT как часть JOIN
+    stmt = sqlite_insert(TaskStatusRollup).from_select(
+        ["task_id", "status", "count"], counts.where(true())
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[TaskStatusRollup.task_id, TaskStatusRollup.status],
+            set_={"count": TaskStatusRollup.count + stmt.excluded.count},
+        )
+    )
+
+
+def _per_ancestor(contributions: Subquery) -> Subquery:
+    """Свернуть вклад по статусам в итог по каждому предку."""
+    return (
+        select(
+            contributions.c.ancestor_id,
+            func.sum(contributions.c.count).label("count"),
+            func.min(contributions.c.earliest).label("earliest"),
+        )
+        .group_by(contributions.c.ancestor_id)
+        .subquery()
+    )
+
+
+async def add_to_rollups(
+    session: AsyncSession, task_ids: Select, include_internal: bool = False
+) -> list[int]:
+    """Учесть задачи в сводках поддеревьев их предков
+
+    Вызывается после вставки задач и строк замыкания, после переноса
+    поддерева и после смены статуса или срока задачи. Стоимость
+    пропорциональна числу задач, умноженному на глубину, и не зависит
+    от размера поддеревьев предков.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_ids (Select): Запрос ID учитываемых задач
+        include_internal (bool): Обновлять и предков внутри набора (для
+            пакета новых задач, вложенных друг в друга); при False набор
+            считается перенесённым целиком, и его внутренние сводки не меняются
+
+    Returns:
+        list[int]: ID предков, чьи сводки изменились
+    """
+    contributions = _rollup_contributions(task_ids, include_internal).subquery()
+    await _bump_status_rollups(
+        session,
+        select(
+            contributions.c.ancestor_id,
+            contributions.c.status,
+            contributions.c.count,
+        ),
+    )
+
+    totals = _per_ancestor(contributions)
+    result = await session.execute(
+        update(Task)
+        .where(Task.id == totals.c.ancestor_id)
+        .values(
+            descendant_count=Task.descendant_count + totals.c.count,
+            # min() с NULL-аргументом в SQLite даёт NULL, поэтому coalesce
+            earliest_open_end_date=func.coalesce(
+                func.min(Task.earliest_open_end_date, totals.c.earliest),
+                Task.earliest_open_end_date,
+                totals.c.earliest,
+            ),
+        )
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars())
+
+
+async def remove_from_rollups(
+    session: AsyncSession, task_ids: Select, include_internal: bool = False
+) -> list[int]:
+    """Исключить задачи из сводок поддеревьев их предков вне набора
+
+    Вызывается до удаления задач, до переноса поддерева и до смены
+    статуса или срока задачи, пока таблица замыкания и строки задач
+    в прежнем состоянии. Ближайший открытый срок пересчитывается по
+    поддереву только у тех предков, для которых его задавали
+    исключаемые задачи.
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+        task_ids (Select): Запрос ID исключаемых задач
+        include_internal (bool): Обновлять и предков внутри набора (для
+            пакета задач, меняющих статус или срок и вложенных друг в друга);
+            при False набор считается поддеревом, чьи внутренние сводки
+            не меняются
+
+    Returns:
+        list[int]: ID предков, чьи сводки изменились
+    """
+    contributions = _rollup_contributions(task_ids, include_internal).subquery()
+    await _bump_status_rollups(
+        session,
+        select(
+            contributions.c.ancestor_id,
+            contributions.c.status,
+            -contributions.c.count,
+        ),
+    )
+
+    closure = aliased(TaskClosure)
+    descendant = aliased(Task)
+    remaining_earliest = (
+        select(func.min(descendant.end_date))
+        .join(closure, closure.descendant_id == descendant.id)
+        .where(
+            closure.ancestor_id == Task.id,
+            closure.depth > 0,
+            descendant.status != CLOSED_STATUS,
+            descendant.id.not_in(task_ids),
+        )
+        .scalar_subquery()
+    )
+    totals = _per_ancestor(contributions)
+    result = await session.execute(
+        update(Task)
+        .where(Task.id == totals.c.ancestor_id)
+        .values(
+            descendant_count=Task.descendant_count - totals.c.count,
+            earliest_open_end_date=case(
+                (
+                    Task.earliest_open_end_date == totals.c.earliest,
+                    remaining_earliest,
+                ),
+                else_=Task.earliest_open_end_date,
+            ),
+        )
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    ancestor_ids = list(result.scalars())
+    if ancestor_ids:
+        await session.execute(
+            delete(TaskStatusRollup).where(
+                TaskStatusRollup.task_id.in_(ancestor_ids),
+                TaskStatusRollup.count <= 0,
+            )
+        )
+    return ancestor_ids
+
+
+async def rebuild_task_rollups(session: AsyncSession) -> None:
+    """Полностью пересчитать сводки поддеревьев по таблице замыкания
+
+    Args:
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+    """
+    await session.execute(delete(TaskStatusRollup))
+    await session.execute(
+        update(Task)
+        .values(descendant_count=0, earliest_open_end_date=None)
+        .execution_options(synchronize_session=False)
+    )
+    await add_to_rollups(session, select(Task.id), include_internal=True)
+
+
+def tree_roots(index: dict[int, TaskRow]) -> list[TaskRow]:
+    """Выбрать корни леса из индекса задач
+
+    Корнем считается задача без родителя или задача, чей родитель
+    не попал в выборку (например, при загрузке отдельной ветки).
+
+    Args:
+        index (dict[int, TaskRow]): Индекс задач из load_task_rows
+
+    Returns:
+        list[TaskRow]: Корневые задачи в порядке возрастания ID
+    """
+    return [task for task in index.values() if task["parent_id"] not in index]
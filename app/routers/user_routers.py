@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import load_only
 
-from app.database.database import get_db
-from app.models.users import User
-from app.shemas.user_schemas import AllUserResponse
+from app.cache.response_cache import cached_json_response, render_rows
+from app.cache.user_cache import user_cache
+from app.database.database import get_read_db
+from app.routers.user_search import get_users_page
+from app.shemas.user_schemas import AllUserResponse, UserListParams
 
 router = APIRouter(prefix="/api")
 
 
 @router.get("/users", response_model=list[AllUserResponse])
-async def get_users(db: AsyncSession = Depends(get_db)) -> list[AllUserResponse]:
+async def get_users(
+    request: Request,
+    params: UserListParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """Получить список пользователей с базовой информацией
 
+    Без параметров возвращает всех пользователей: список отдаётся из кэша
+    пользователей процесса, если в нём помещаются все пользователи, иначе
+    читается из БД. С q, limit или cursor возвращает страницу
+    пользователей (для подсказок при выборе исполнителей), курсор
+    следующей страницы передаётся в заголовке X-Next-Cursor.
+
+    Ответ кэшируется и содержит ETag, при совпадении If-None-Match
+    возвращается 304.
+
     Args:
+        request (Request): Входящий запрос
+        params (UserListParams): Поиск по префиксу и параметры пагинации
         db (AsyncSession): Асинхронная сессия SQLAlchemy
 
     Returns:
@@ -26,8 +41,15 @@ async def get_users(db: AsyncSession = Depends(get_db)) -> list[AllUserResponse]
 
     Status Codes:
         200 OK: Успешный ответ
+        304 Not Modified: Данные не изменились
     """
-    stmt = select(User).options(load_only(User.id, User.name, User.surname, User.email))
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    return [AllUserResponse.model_validate(user) for user in users]
+
+    async def render() -> tuple[bytes, dict[str, str]]:
+        if params.is_empty():
+            return render_rows(await user_cache.list_all(db)), {}
+
+        users, next_cursor = await get_users_page(params, db)
+        headers = {} if next_cursor is None else {"X-Next-Cursor": str(next_cursor)}
+        return render_rows(users), headers
+
+    return await cached_json_response(request, ("users",), render)
@@ -0,0 +1,83 @@
+import re
+
+from sqlalchemy import (
+    Integer,
+    SQLColumnExpression,
+    column,
+    literal_column,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio.session import AsyncSession
+
+from app.cache.user_cache import USER_COLUMNS, UserRow
+from app.models.users import User
+from app.shemas.user_schemas import UserListParams
+
+USER_PAGE_SIZE = 20
+
+users_fts = table("users_fts", column("rowid", Integer))
+"""Индекс FTS5 по name/surname/email пользователей.
+
+Создаётся миграцией и синхронизируется с users триггерами.
+"""
+
+
+def prefix_query(text: str) -> str | None:
+    """Преобразовать строку подсказки в запрос FTS5 по префиксам слов
+
+    Каждое слово берётся в кавычки и ищется по префиксу, поэтому
+    "mar iv" находит Maria Ivanova, а операторы FTS5 во вводе
+    не интерпретируются.
+
+    Args:
+        text (str): Строка, введённая пользователем
+
+    Returns:
+        str | None: Запрос для MATCH или None, если в строке нет слов
+    """
+    terms = [f'"{term}"*' for term in re.findall(r"\w+", text)]
+    return " ".join(terms) if terms else None
+
+
+async def get_users_page(
+    params: UserListParams, session: AsyncSession
+) -> tuple[list[UserRow], int | None]:
+    """Получить страницу пользователей с поиском по префиксу и keyset-пагинацией
+
+    Пользователи упорядочены по ID, страница продолжается условием
+    id > cursor. С q поиск идёт по индексу FTS5 (с индексами коротких
+    префиксов), который отдаёт совпадения в порядке rowid, поэтому
+    страница читает только limit + 1 строк.
+
+    Args:
+        params (UserListParams): Строка поиска и параметры пагинации
+        session (AsyncSession): Асинхронная сессия SQLAlchemy
+
+    Returns:
+        tuple[list[UserRow], int | None]: Пользователи в форме AllUserResponse
+            и курсор следующей страницы (None, если страница последняя)
+    """
+    limit = params.limit or USER_PAGE_SIZE
+    position: SQLColumnExpression[int] = User.id
+    stmt = select(*USER_COLUMNS)
+    if params.q is not None:
+        query = prefix_query(params.q)
+        if query is None:
+            return [], None
+        # Условие и порядок по rowid FTS5 применяет сам, без сортировки совпадений
+        position = users_fts.c.rowid
+        stmt = (
+            stmt.select_from(users_fts)
+            .join(User, User.id == users_fts.c.rowid)
+            .where(literal_column("users_fts").match(query))
+        )
+    if params.cursor is not None:
+        stmt = stmt.where(position > params.cursor)
+    stmt = stmt.order_by(position).limit(limit + 1)
+
+    users = [row._asdict() for row in await session.execute(stmt)]
+    if len(users) > limit:
+        users = users[:limit]
+        return users, users[-1]["id"]
+    return users, None
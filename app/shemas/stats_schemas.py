@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class TaskStatsResponse(BaseModel):
+    """Сводная статистика задач.
+
+    Attributes:
+        total (int): Всего задач
+        by_status (dict[str, int]): Задачи по статусу
+        by_author (dict[int, int]): Задачи по ID автора
+        by_assignee (dict[int, int]): Назначения по ID исполнителя
+        overdue (int): Незавершённые задачи с истёкшим сроком
+    """
+
+    total: int
+    by_status: dict[str, int]
+    by_author: dict[int, int]
+    by_assignee: dict[int, int]
+    overdue: int
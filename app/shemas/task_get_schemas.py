@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class UserResponse(BaseModel):
@@ -47,6 +47,10 @@ class TaskResponse(BaseModel):
         author (UserResponse): Данные автора задачи
         status (str): Текущий статус задачи
         assignees (list[AssigneeResponse]): Список исполнителей
+        descendant_count (int): Число потомков на всех уровнях вложенности
+        descendant_statuses (dict[str, int]): Число потомков по статусам
+        earliest_open_end_date (datetime | None): Ближайший срок среди
+            незавершённых потомков
 
     Note:
         Даты сериализуются в формате "YYYY-MM-DD HH:MM"
@@ -62,6 +66,9 @@ class TaskResponse(BaseModel):
     author: UserResponse
     status: str
     assignees: list[AssigneeResponse] = []
+    descendant_count: int = 0
+    descendant_statuses: dict[str, int] = {}
+    earliest_open_end_date: datetime | None = None
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -85,6 +92,10 @@ class TaskResponseById(BaseModel):
         end_date (datetime | None): Дата завершения (ISO 8601)
         author (UserResponse): Данные автора задачи
         assignees (list[AssigneeResponse]): Список исполнителей
+        descendant_count (int): Число потомков на всех уровнях вложенности
+        descendant_statuses (dict[str, int]): Число потомков по статусам
+        earliest_open_end_date (datetime | None): Ближайший срок среди
+            незавершённых потомков
 
     Note:
         Даты сериализуются в формате "YYYY-MM-DD HH:MM"
@@ -98,8 +109,135 @@ class TaskResponseById(BaseModel):
     end_date: datetime | None = None
     author: UserResponse
     assignees: list[AssigneeResponse] = []
+    descendant_count: int = 0
+    descendant_statuses: dict[str, int] = {}
+    earliest_open_end_date: datetime | None = None
 
     model_config = ConfigDict(
         from_attributes=True,
         json_encoders={datetime: lambda v: v.strftime("%Y-%m-%d %H:%M")},
     )
+
+
+class TaskChangesResponse(BaseModel):
+    """Изменения задач после курсора журнала изменений.
+
+    Attributes:
+        changed (list[TaskResponse]): Созданные и изменённые задачи в текущем
+            состоянии; children не заполняется, структура задаётся parent_id
+        deleted (list[int]): ID удалённых задач
+        cursor (int): Курсор для следующего запроса
+        has_more (bool): Изменения не поместились в limit, нужно повторить
+            запрос с новым курсором
+    """
+
+    changed: list[TaskResponse]
+    deleted: list[int]
+    cursor: int
+    has_more: bool
+
+
+class TaskListParams(BaseModel):
+    """Параметры фильтрации и keyset-пагинации списка задач.
+
+    Фильтры применяются к задачам выводимого уровня: по умолчанию это
+    корневые задачи, при указании parent_id - прямые подзадачи этой задачи.
+    Каждая найденная задача возвращается вместе со всем своим поддеревом.
+
+    Attributes:
+        status (str | None): Статус задачи
+        author_id (int | None): ID автора задачи
+        assignee_id (int | None): ID пользователя среди исполнителей
+        parent_id (int | None): ID родителя выводимого уровня (по умолчанию корни)
+        end_date_from (datetime | None): Нижняя граница срока (включительно)
+        end_date_to (datetime | None): Верхняя граница срока (включительно)
+        limit (int | None): Размер страницы (без ограничения, если не задан)
+        cursor (int | None): ID последней задачи предыдущей страницы
+
+    Note:
+        Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    """
+
+    status: str | None = None
+    author_id: int | None = None
+    assignee_id: int | None = None
+    parent_id: int | None = None
+    end_date_from: datetime | None = None
+    end_date_to: datetime | None = None
+    limit: int | None = Field(None, ge=1, le=500)
+    cursor: int | None = None
+
+    def is_empty(self) -> bool:
+        """Проверить, что не задан ни один фильтр и пагинация."""
+        return not self.model_dump(exclude_none=True)
+
+
+class TaskFieldsParams(BaseModel):
+    """Параметры выборочных полей и глубины дерева задач.
+
+    Attributes:
+        fields (str | None): Поля задач через запятую из полей TaskResponse
+            и children_count (число прямых подзадач); id и parent_id
+            возвращаются всегда
+        depth (int | None): Глубина вложенных подзадач (0 - без подзадач);
+            при заданной глубине в задачах возвращается children_count
+
+    Note:
+        Незапрошенные поля не выбираются из БД
+    """
+
+    fields: str | None = Field(None, pattern=r"^\w+(,\w+)*$")
+    depth: int | None = Field(None, ge=0)
+
+    def is_empty(self) -> bool:
+        """Проверить, что не заданы ни поля, ни глубина."""
+        return not self.model_dump(exclude_none=True)
+
+
+class TaskSearchParams(BaseModel):
+    """Параметры полнотекстового поиска задач.
+
+    Attributes:
+        q (str): Поисковая строка (слова ищутся по заголовку и описанию,
+            последнее слово - по префиксу)
+        status (str | None): Статус задачи
+        assignee_id (int | None): ID пользователя среди исполнителей
+        limit (int): Размер страницы
+        cursor (str | None): Курсор из X-Next-Cursor предыдущей страницы
+    """
+
+    q: str = Field(min_length=1, max_length=200)
+    status: str | None = None
+    assignee_id: int | None = None
+    limit: int = Field(20, ge=1, le=100)
+    cursor: str | None = None
+
+
+class TaskSearchResult(BaseModel):
+    """Результат полнотекстового поиска задачи.
+
+    Attributes:
+        id (int): Уникальный идентификатор задачи
+        title (str): Название задачи
+        status (str): Текущий статус задачи
+        parent_id (int | None): ID родительской задачи (если есть)
+        end_date (datetime | None): Дата завершения
+        snippet (str): Фрагмент текста с найденными словами в <mark>,
+            остальной текст экранирован для HTML
+        rank (float): Релевантность bm25 (меньше - релевантнее)
+
+    Note:
+        Даты сериализуются в формате "YYYY-MM-DD HH:MM"
+    """
+
+    id: int
+    title: str
+    status: str
+    parent_id: int | None = None
+    end_date: datetime | None = None
+    snippet: str
+    rank: float
+
+    model_config = ConfigDict(
+        json_encoders={datetime: lambda v: v.strftime("%Y-%m-%d %H:%M")},
+    )
@@ -44,3 +44,33 @@ class TaskUpdate(BaseModel):
             }
         },
     )
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    """Элемент пакетного обновления задач.
+
+    Помимо полей TaskUpdate содержит ID обновляемой задачи; изменяются
+    только переданные поля.
+
+    Attributes:
+        id (int): ID обновляемой задачи
+    """
+
+    id: int
+
+
+class TaskBatchOutcome(BaseModel):
+    """Результат пакетной операции для одного элемента.
+
+    Attributes:
+        index (int): Позиция элемента в запросе
+        id (int): ID задачи
+        outcome (str): "updated", "unchanged", "deleted", "not_found"
+            или "rejected"
+        error (str | None): Причина отказа для "not_found" и "rejected"
+    """
+
+    index: int
+    id: int
+    outcome: str
+    error: str | None = None
@@ -46,3 +46,71 @@ class TaskCreate(BaseModel):
             }
         },
     )
+
+
+class TaskBatchItem(TaskCreate):
+    """Элемент пакетного создания задач.
+
+    Помимо полей TaskCreate позволяет сослаться на родителя, создаваемого
+    в том же пакете: родитель помечается ref, подзадача указывает его в
+    parent_ref. Одновременно задавать parent_id и parent_ref нельзя.
+
+    Attributes:
+        ref (str | None): Клиентский идентификатор задачи внутри пакета
+        parent_ref (str | None): ref родительской задачи из этого же пакета
+    """
+
+    ref: str | None = None
+    parent_ref: str | None = None
+
+
+class TaskBatchResult(BaseModel):
+    """Результат создания одного элемента пакета.
+
+    Attributes:
+        index (int): Позиция элемента в запросе
+        ref (str | None): Клиентский идентификатор элемента
+        id (int): ID созданной задачи
+    """
+
+    index: int
+    ref: str | None = None
+    id: int
+
+
+class TaskBatchError(BaseModel):
+    """Ошибка валидации одного элемента пакета.
+
+    Attributes:
+        index (int): Позиция элемента в запросе
+        ref (str | None): Клиентский идентификатор элемента
+        error (str): Описание ошибки
+    """
+
+    index: int
+    ref: str | None = None
+    error: str
+
+
+class TaskAssigneesChange(BaseModel):
+    """Модель добавления или снятия исполнителей задачи.
+
+    Attributes:
+        user_ids (list[int]): ID пользователей
+    """
+
+    user_ids: list[int] = Field(min_length=1)
+
+    model_config = ConfigDict(json_schema_extra={"example": {"user_ids": [2, 3]}})
+
+
+class TaskAssigneesResponse(BaseModel):
+    """Исполнители задачи после изменения.
+
+    Attributes:
+        id (int): ID задачи
+        assignee_user_ids (list[int]): ID всех исполнителей задачи по возрастанию
+    """
+
+    id: int
+    assignee_user_ids: list[int]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AllUserResponse(BaseModel):
@@ -19,3 +19,26 @@ class AllUserResponse(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
     )
+
+
+class UserListParams(BaseModel):
+    """Параметры поиска и keyset-пагинации списка пользователей.
+
+    Attributes:
+        q (str | None): Начало имени, фамилии или email (без учёта регистра;
+            несколько слов ищутся вместе, например "mar iv")
+        limit (int | None): Размер страницы (по умолчанию USER_PAGE_SIZE,
+            если заданы q или cursor)
+        cursor (int | None): ID последнего пользователя предыдущей страницы
+
+    Note:
+        Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    """
+
+    q: str | None = Field(None, min_length=1, max_length=100)
+    limit: int | None = Field(None, ge=1, le=100)
+    cursor: int | None = None
+
+    def is_empty(self) -> bool:
+        """Проверить, что не заданы ни поиск, ни пагинация."""
+        return not self.model_dump(exclude_none=True)
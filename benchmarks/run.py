@@ -0,0 +1,354 @@
+"""Нагрузочный прогон маршрутов API внутри процесса.
+
+Приложение main.app запускается in-process поверх сгенерированной базы,
+сценарии из benchmarks.scenarios выполняются через httpx.AsyncClient
+с заданной конкурентностью. Результаты пишутся в JSON и могут
+сравниваться с результатами предыдущего прогона.
+
+Пример запуска из корня репозитория:
+
+    python -m benchmarks.run --tasks 20000 --users 200 --requests 500 \\
+        --concurrency 16 --output bench.json --baseline bench_main.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import httpx
+
+from benchmarks.scenarios import SCENARIOS, BenchmarkState, Scenario
+
+SQL_QUERIES_PATTERN = re.compile(r'desc="queries: (\d+)"')
+COMPARED_METRICS = (
+    ("latency_ms", "p50", 1),
+    ("latency_ms", "p95", 1),
+    ("throughput_rps", None, -1),
+    ("sql_per_request", "mean", 1),
+)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(description="Benchmark API routes in-process")
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=None,
+        help="SQLite file to reuse; generated on first use (default: temp file)",
+    )
+    parser.add_argument("--requests", type=int, default=200, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="per read scenario")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="comma-separated subset of: " + ", ".join(SCENARIOS),
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="keep the response cache enabled (default: measure uncached reads)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="allowed regression against the baseline, percent",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with code 1 on baseline regressions or exceeded SQL budgets",
+    )
+    return parser.parse_args(argv)
+
+
+def prepare_database(args: argparse.Namespace) -> Path:
+    """Настроить окружение приложения на базу прогона и применить миграции
+
+    Должна вызываться до импорта модулей приложения: настройки читаются
+    из окружения при импорте. Данные генерируются при старте приложения
+    через init_data (SEED_TASKS), если база пуста.
+
+    Args:
+        args (argparse.Namespace): Аргументы командной строки
+
+    Returns:
+        Path: Путь к файлу базы
+    """
+    database = args.database
+    if database is None:
+        database = Path(tempfile.mkdtemp(prefix="bench-")) / "bench.db"
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database.resolve()}"
+    os.environ["SEED_TASKS"] = str(args.tasks)
+    os.environ["SEED_USERS"] = str(args.users)
+    os.environ["SEED_RANDOM"] = str(args.seed)
+
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config("alembic.ini"), "head")
+    return database
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Перцентиль по отсортированному списку (метод ближайшего ранга)."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(fraction * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+def peak_rss_mb() -> float:
+    """Пиковый RSS процесса в МиБ."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт КиБ, macOS - байты
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    state: BenchmarkState,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    """Выполнить сценарий и собрать метрики
+
+    Args:
+        client (httpx.AsyncClient): Клиент, подключённый к приложению
+        scenario (Scenario): Сценарий
+        state (BenchmarkState): Общее состояние прогона
+        args (argparse.Namespace): Аргументы командной строки
+
+    Returns:
+        dict[str, Any]: Пропускная способность, перцентили латентности,
+            SQL-запросы на запрос, ошибки и пиковый RSS
+    """
+    total = args.requests
+    if scenario.prepare is not None:
+        await scenario.prepare(client, state, total)
+
+    async def send() -> tuple[float, httpx.Response]:
+        url, body = scenario.build(state)
+        started_at = perf_counter()
+        response = await client.request(scenario.method, url, json=body)
+        return perf_counter() - started_at, response
+
+    if scenario.method == "GET":
+        for _ in range(args.warmup):
+            await send()
+
+    latencies: list[float] = []
+    statements: list[int] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            latency, response = await send()
+            latencies.append(latency)
+            match = SQL_QUERIES_PATTERN.search(
+                response.headers.get("server-timing", "")
+            )
+            statements.append(int(match.group(1)) if match else 0)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+
+    started_at = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    duration = perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        "method": scenario.method,
+        "route": scenario.route,
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "mean": (
+                round(1000 * sum(latencies) / len(latencies), 3) if latencies else 0.0
+            ),
+            "p50": round(1000 * percentile(latencies, 0.50), 3),
+            "p95": round(1000 * percentile(latencies, 0.95), 3),
+            "p99": round(1000 * percentile(latencies, 0.99), 3),
+            "max": round(1000 * latencies[-1], 3) if latencies else 0.0,
+        },
+        "sql_per_request": {
+            "mean": round(sum(statements) / len(statements), 2) if statements else 0.0,
+            "max": max(statements, default=0),
+            "budget": scenario.sql_budget,
+            "over_budget": sum(count > scenario.sql_budget for count in statements),
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare_with_baseline(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """Сравнить прогон с базовым и вывести таблицу изменений
+
+    Args:
+        results (dict[str, Any]): Результаты текущего прогона
+        baseline (dict[str, Any]): Результаты базового прогона
+        threshold (float): Допустимое ухудшение в процентах
+
+    Returns:
+        list[str]: Описания регрессий
+    """
+    regressions = []
+    print(
+        f"\n{'scenario':<14} {'metric':<22} "
+        f"{'baseline':>10} {'current':>10} {'change':>8}"
+    )
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric, key, direction in COMPARED_METRICS:
+            before, after = previous[metric], current[metric]
+            if key is not None:
+                before, after = before[key], after[key]
+            change = 100.0 * (after - before) / before if before else 0.0
+            label = metric if key is None else f"{metric}.{key}"
+            worse = direction * change > threshold
+            flag = "  REGRESSION" if worse else ""
+            print(
+                f"{name:<14} {label:<22} "
+                f"{before:>10} {after:>10} {change:>+7.1f}%{flag}"
+            )
+            if worse:
+                regressions.append(f"{name}: {label} {change:+.1f}%")
+    return regressions
+
+
+def git_revision() -> str | None:
+    """Текущий коммит репозитория, если он доступен."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace, database: Path) -> dict[str, Any]:
+    """Запустить приложение in-process и выполнить выбранные сценарии."""
+    from sqlalchemy import select
+
+    from app.cache.response_cache import response_cache
+    from app.config import settings
+    from app.database.database import AsyncReadSessionLocal
+    from app.models.tasks import Task
+    from app.models.users import User
+    from main import app, lifespan
+
+    if not args.cache:
+        response_cache.max_entries = 0
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(SCENARIOS))
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    results: dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": str(database),
+            "db_profile": settings.db_profile,
+            "write_batching": settings.write_batching,
+            "args": {
+                name: str(value) if isinstance(value, Path) else value
+                for name, value in vars(args).items()
+            },
+        },
+        "scenarios": {},
+    }
+
+    async with lifespan(app):
+        async with AsyncReadSessionLocal() as session:
+            task_ids = list((await session.execute(select(Task.id))).scalars())
+            user_ids = list((await session.execute(select(User.id))).scalars())
+        state = BenchmarkState(
+            rng=random.Random(args.seed),
+            task_ids=task_ids,
+            user_ids=user_ids,
+        )
+        results["meta"]["dataset"] = {"tasks": len(task_ids), "users": len(user_ids)}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            for name in SCENARIOS:
+                if name not in names:
+                    continue
+                result = await run_scenario(client, SCENARIOS[name], state, args)
+                results["scenarios"][name] = result
+                latency = result["latency_ms"]
+                print(
+                    f"{name:<14} {result['throughput_rps']:>9.1f} rps  "
+                    f"p50 {latency['p50']:>8.2f} ms  p95 {latency['p95']:>8.2f} ms  "
+                    f"p99 {latency['p99']:>8.2f} ms  "
+                    f"sql {result['sql_per_request']['mean']:>5.1f}  "
+                    f"errors {result['errors']}"
+                )
+
+    results["meta"]["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Точка входа: прогон, сохранение JSON и сравнение с базовым."""
+    args = parse_args(argv)
+    database = prepare_database(args)
+    results = asyncio.run(run(args, database))
+
+    args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"\nResults written to {args.output}")
+
+    problems = [
+        f"{name}: {result['sql_per_request']['over_budget']} requests over "
+        f"SQL budget {result['sql_per_request']['budget']}"
+        for name, result in results["scenarios"].items()
+        if result["sql_per_request"]["over_budget"]
+    ]
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        problems += compare_with_baseline(results, baseline, args.threshold)
+
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+import random
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+
+@dataclass
+class BenchmarkState:
+    """Общее состояние прогона, разделяемое сценариями.
+
+    Attributes:
+        rng (random.Random): Генератор случайных чисел (детерминирован зерном)
+        task_ids (list[int]): ID существующих задач для чтения и изменения
+        user_ids (list[int]): ID существующих пользователей
+        created_ids (list[int]): ID задач, подготовленных для удаления;
+            сценарий удаления удаляет только их, не трогая исходное дерево
+    """
+
+    rng: random.Random
+    task_ids: list[int]
+    user_ids: list[int]
+    created_ids: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Сценарий нагрузки на один маршрут.
+
+    Attributes:
+        name (str): Имя сценария в отчёте
+        method (str): HTTP-метод
+        route (str): Шаблон маршрута (для отчёта и меток /metrics)
+        build (Callable): Функция, возвращающая (url, json-тело или None)
+        expected_status (int): Ожидаемый код ответа
+        sql_budget (int): Максимум SQL-запросов на один запрос
+        prepare (Callable | None): Подготовка данных перед замером, получает
+            клиент, состояние и число запросов
+    """
+
+    name: str
+    method: str
+    route: str
+    build: Callable[[BenchmarkState], tuple[str, Any]]
+    expected_status: int
+    sql_budget: int
+    prepare: (
+        Callable[[httpx.AsyncClient, BenchmarkState, int], Awaitable[None]] | None
+    ) = None
+
+
+def _random_task(state: BenchmarkState) -> int:
+    return state.task_ids[int(state.rng.random() * len(state.task_ids))]
+
+
+def _random_users(state: BenchmarkState, count: int) -> list[int]:
+    return state.rng.sample(state.user_ids, min(count, len(state.user_ids)))
+
+
+def _task_body(state: BenchmarkState) -> dict[str, Any]:
+    return {
+        "title": f"Bench task {state.rng.randrange(10**6)}",
+        "description": "Created by benchmark",
+        "end_date": "2026-06-01T12:00:00",
+        "parent_id": _random_task(state),
+        "author_id": _random_users(state, 1)[0],
+        "assignee_user_ids": _random_users(state, 2),
+    }
+
+
+async def _create_for_delete(
+    client: httpx.AsyncClient, state: BenchmarkState, count: int
+) -> None:
+    # Задачи для удаления создаются одним пакетом вне замера
+    if count == 0:
+        return
+    items = [_task_body(state) for _ in range(count)]
+    response = await client.post("/api/tasks:batch", json=items)
+    response.raise_for_status()
+    state.created_ids.extend(result["id"] for result in response.json())
+
+
+def _pop_created(state: BenchmarkState) -> tuple[str, None]:
+    return f"/api/tasks/{state.created_ids.pop()}", None
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            name="tasks_page",
+            method="GET",
+            route="/api/tasks",
+            build=lambda state: ("/api/tasks?limit=20", None),
+            expected_status=200,
+            sql_budget=4,
+        ),
+        Scenario(
+            name="tasks_tree",
+            method="GET",
+            route="/api/tasks",
+            build=lambda state: ("/api/tasks", None),
+            expected_status=200,
+            sql_budget=5,
+        ),
+        Scenario(
+            name="tasks_sparse",
+            method="GET",
+            route="/api/tasks",
+            build=lambda state: (
+                "/api/tasks?fields=title,status,children_count&depth=0",
+                None,
+            ),
+            expected_status=200,
+            sql_budget=3,
+        ),
+        Scenario(
+            name="task_detail",
+            method="GET",
+            route="/api/tasks/{id}",
+            build=lambda state: (f"/api/tasks/{_random_task(state)}", None),
+            expected_status=200,
+            sql_budget=3,
+        ),
+        Scenario(
+            name="task_subtree",
+            method="GET",
+            route="/api/tasks/{id}/subtree",
+            build=lambda state: (f"/api/tasks/{_random_task(state)}/subtree", None),
+            expected_status=200,
+            sql_budget=3,
+        ),
+        Scenario(
+            name="users",
+            method="GET",
+            route="/api/users",
+            build=lambda state: ("/api/users", None),
+            expected_status=200,
+            sql_budget=0,
+        ),
+        Scenario(
+            name="users_search",
+            method="GET",
+            route="/api/users",
+            build=lambda state: (
+                f"/api/users?q=user{state.rng.randint(1, 99)}&limit=10",
+                None,
+            ),
+            expected_status=200,
+            sql_budget=1,
+        ),
+        Scenario(
+            name="stats",
+            method="GET",
+            route="/api/stats",
+            build=lambda state: ("/api/stats", None),
+            expected_status=200,
+            sql_budget=3,
+        ),
+        Scenario(
+            name="task_create",
+            method="POST",
+            route="/api/tasks",
+            build=lambda state: ("/api/tasks", _task_body(state)),
+            expected_status=201,
+            sql_budget=8,
+        ),
+        Scenario(
+            name="task_update",
+            method="PATCH",
+            route="/api/tasks/{id}",
+            build=lambda state: (
+                f"/api/tasks/{_random_task(state)}",
+                {"status": state.rng.choice(["pending", "in_progress", "completed"])},
+            ),
+            expected_status=200,
+            sql_budget=10,
+        ),
+        Scenario(
+            name="tasks_batch",
+            method="PATCH",
+            route="/api/tasks:batch",
+            build=lambda state: (
+                "/api/tasks:batch",
+                [
+                    {
+                        "id": task_id,
+                        "status": state.rng.choice(["pending", "completed"]),
+                    }
+                    for task_id in state.rng.sample(
+                        state.task_ids, min(50, len(state.task_ids))
+                    )
+                ],
+            ),
+            expected_status=200,
+            sql_budget=8,
+        ),
+        Scenario(
+            name="task_delete",
+            method="DELETE",
+            route="/api/tasks/{id}",
+            build=_pop_created,
+            expected_status=204,
+            sql_budget=8,
+            prepare=_create_for_delete,
+        ),
+    )
+}
+"""Сценарии в порядке запуска."""
@@ -4,23 +4,46 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from app.cache.user_cache import user_cache
+from app.database.change_log import change_log_compactor
 from app.database.utils import init_data
-from app.routers import task_routers, user_routers
+from app.database.write_queue import write_coordinator
+from app.metrics.middleware import MetricsMiddleware
+from app.routers import (
+    event_routers,
+    metrics_routers,
+    stats_routers,
+    task_routers,
+    user_routers,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Управляет жизненным циклом приложения.
 
-    Выполняет инициализацию данных при старте приложения.
+    Выполняет инициализацию данных при старте приложения, прогревает
+    кэш пользователей, запускает уплотнение журнала изменений
+    и координатор групповой фиксации записей, если он включён.
     """
     await init_data()
+    await user_cache.warm()
+    await change_log_compactor.start()
+    if write_coordinator is not None:
+        await write_coordinator.start()
     yield
+    if write_coordinator is not None:
+        await write_coordinator.stop()
+    await change_log_compactor.stop()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 app.mount("/static", StaticFiles(directory="static", html=True), name="static")
 
 app.include_router(task_routers.router)
 app.include_router(user_routers.router)
+app.include_router(stats_routers.router)
+app.include_router(metrics_routers.router)
+app.include_router(event_routers.router)
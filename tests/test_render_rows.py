@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models.changes  # noqa: F401
+import app.models.stats  # noqa: F401
+from app.cache.response_cache import render_rows
+from app.cache.user_cache import user_cache
+from app.database.database import Base
+from app.models.tasks import Task, TaskAssignee, TaskStatusRollup
+from app.models.users import User
+from app.routers.task_management import get_task_detail
+from app.routers.task_tree import load_task_rows, tree_roots
+from app.shemas.task_get_schemas import TaskResponse, TaskResponseById
+
+DATES = ("created_at", "end_date", "earliest_open_end_date")
+
+USERS: list[dict[str, Any]] = [
+    dict(id=1, name="Мария", surname="Иванова", email="maria@example.com"),
+    dict(id=2, name='O"Brien \\ Ñoño', surname="Ünal\t😀", email="o@example.com"),
+]
+
+TASKS: list[dict[str, Any]] = [
+    dict(
+        id=1,
+        title="Корневая задача",
+        description='Кавычки " и обратный слэш \\\nвторая строка </script>',
+        created_at=datetime(2025, 1, 2, 3, 4, 59, 123456),
+        end_date=datetime(2025, 12, 31, 23, 59, 30),
+        status="in_progress",
+        author_id=1,
+        descendant_count=2,
+        earliest_open_end_date=datetime(2025, 6, 1, 9, 5, 1),
+    ),
+    dict(
+        id=2,
+        title="Подзадача \u2028 \x01",
+        description="",
+        created_at=datetime(2025, 1, 3, 0, 0),
+        end_date=datetime(2026, 1, 1, 0, 0, 59),
+        status="pending",
+        parent_id=1,
+        author_id=2,
+        descendant_count=1,
+        earliest_open_end_date=None,
+    ),
+    dict(
+        id=3,
+        title="Лист",
+        description="emoji 😀",
+        created_at=datetime(2024, 2, 29, 12, 30),
+        end_date=datetime(2025, 6, 1, 9, 5, 1),
+        status="done",
+        parent_id=2,
+        author_id=1,
+    ),
+]
+
+ASSIGNEES: list[dict[str, Any]] = [
+    dict(task_id=1, user_id=2, assignee_status="в работе"),
+    dict(task_id=1, user_id=1, assignee_status="pending"),
+    dict(task_id=3, user_id=2, assignee_status="done"),
+]
+
+ROLLUPS: list[dict[str, Any]] = [
+    dict(task_id=1, status="done", count=1),
+    dict(task_id=1, status="pending", count=1),
+    dict(task_id=2, status="done", count=1),
+]
+
+
+def with_datetimes(task: dict[str, Any]) -> dict[str, Any]:
+    """Подставить в словарь задачи исходные datetime вместо строк из SQL."""
+    source = next(item for item in TASKS if item["id"] == task["id"])
+    expected = {**task, **{field: source.get(field) for field in DATES}}
+    if "children" in task:
+        expected["children"] = [with_datetimes(child) for child in task["children"]]
+    return expected
+
+
+async def load_rows() -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add_all(User(**user) for user in USERS)
+        await session.flush()
+        session.add_all(Task(**task) for task in TASKS)
+        await session.flush()
+        session.add_all(TaskAssignee(**assignee) for assignee in ASSIGNEES)
+        session.add_all(TaskStatusRollup(**rollup) for rollup in ROLLUPS)
+        await session.commit()
+
+    user_cache.invalidate()
+    async with session_factory() as session:
+        roots = tree_roots(await load_task_rows(session))
+        details = [await get_task_detail(task["id"], session) for task in TASKS]
+    await engine.dispose()
+    user_cache.invalidate()
+    return roots, [detail for detail in details if detail is not None]
+
+
+def test_render_rows_matches_task_list_schema() -> None:
+    roots, _ = asyncio.run(load_rows())
+    adapter = TypeAdapter(list[TaskResponse])
+
+    expected = adapter.dump_json(
+        adapter.validate_python([with_datetimes(root) for root in roots])
+    )
+
+    assert render_rows(roots) == expected
+    assert b'"earliest_open_end_date":null' in expected
+    assert b'"created_at":"2025-01-02 03:04"' in expected
+
+
+def test_render_rows_matches_task_detail_schema() -> None:
+    _, details = asyncio.run(load_rows())
+
+    assert len(details) == len(TASKS)
+    for detail in details:
+        expected = TaskResponseById.model_validate(
+            with_datetimes(detail)
+        ).model_dump_json()
+        assert render_rows(detail) == expected.encode()